@@ -1,36 +1,76 @@
 from flask import Flask, render_template
 from backend.config import Config
-from backend.services.gemini_service import GeminiService
+from backend.utils.admission import init_admission
+from backend.utils.assets import init_assets
+from backend.utils.compression import init_compression
+from backend.utils.security import init_security
+from backend.services.gemini_service import GeminiService, StubGeminiService
 from dotenv import load_dotenv
 import os
 
 # Load .env file directly in app.py to ensure it's loaded
 load_dotenv()
 
-def create_app():
+def create_app(debug=False):
     app = Flask(__name__, 
                 static_folder='../frontend/static',
                 template_folder='../frontend/templates')
     app.config.from_object(Config)
+    app.debug = debug
     
-    # Print environment variables for debugging
-    env_api_key = os.environ.get('GEMINI_API_KEY')
-    config_api_key = app.config.get('GEMINI_API_KEY')
+    stub_latency = app.config.get('GEMINI_STUB_LATENCY')
+    if stub_latency is not None:
+        # Canned model responses so load tests measure the server, not Gemini
+        print(f"Using stub Gemini service with {stub_latency}s latency")
+        gemini_service = StubGeminiService(float(stub_latency))
+    else:
+        # Print environment variables for debugging
+        env_api_key = os.environ.get('GEMINI_API_KEY')
+        config_api_key = app.config.get('GEMINI_API_KEY')
+        
+        print(f"Env API key: {env_api_key[:4]}...{env_api_key[-4:] if env_api_key and len(env_api_key) > 8 else 'None'}")
+        print(f"Config API key: {config_api_key[:4]}...{config_api_key[-4:] if config_api_key and len(config_api_key) > 8 else 'None'}")
+        
+        # Use the API key directly from environment instead of config
+        api_key = os.environ.get('GEMINI_API_KEY')
+        
+        # Test Gemini API key
+        print(f"Testing Gemini API key...")
+        gemini_service = GeminiService(api_key)
+        gemini_service.test_api_key()
     
-    print(f"Env API key: {env_api_key[:4]}...{env_api_key[-4:] if env_api_key and len(env_api_key) > 8 else 'None'}")
-    print(f"Config API key: {config_api_key[:4]}...{config_api_key[-4:] if config_api_key and len(config_api_key) > 8 else 'None'}")
+    # One shared client per process; preloaded servers share it copy-on-write
+    app.extensions['gemini_service'] = gemini_service
     
-    # Use the API key directly from environment instead of config
-    api_key = os.environ.get('GEMINI_API_KEY')
+    # Serve fingerprinted, precompressed static files and compress large JSON responses
+    init_assets(app)
+    init_compression(app)
     
-    # Test Gemini API key
-    print(f"Testing Gemini API key...")
-    gemini_service = GeminiService(api_key)
-    gemini_service.test_api_key()
+    # Cap concurrent analysis requests so one client can't take every worker
+    init_admission(app)
     
-    # Import and register only the food routes blueprint
+    # Cache resolved users and goals for token-authenticated requests; refuses the placeholder SECRET_KEY
+    init_security(app)
+    
+    # Set up the database used for syncing client data
+    from backend.database.models import db
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    
+    # Import and register the route blueprints
     from backend.routes.food_routes import food_routes
+    from backend.routes.sync_routes import sync_bp
+    from backend.routes.data_routes import data_bp
+    from backend.routes.nutrition_routes import nutrition_bp
+    from backend.routes.auth_routes import auth_bp
+    from backend.routes.tracking_routes import tracking_bp
     app.register_blueprint(food_routes)
+    app.register_blueprint(sync_bp)
+    app.register_blueprint(data_bp)
+    app.register_blueprint(nutrition_bp)
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(tracking_bp, url_prefix='/api/tracking')
     
     @app.route('/')
     def index():
@@ -39,5 +79,7 @@ def create_app():
     return app
 
 if __name__ == '__main__':
-    app = create_app()
-    app.run(debug=True)
\ No newline at end of file
+    # Development server only; use gunicorn with gunicorn.conf.py in production
+    debug = os.environ.get('DEBUG', 'True').lower() == 'true'
+    app = create_app(debug=debug)
+    app.run(debug=debug)
@@ -1,6 +1,8 @@
+import os
+
 class Config:
-    SECRET_KEY = '__CHANGE_ME__'  # Update with a strong secret key
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///site.db'  # Update with your database URI
+    SECRET_KEY = os.environ.get('SECRET_KEY', '__CHANGE_ME__')  # Update with a strong secret key; also signs access tokens (required outside debug)
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///site.db')  # Update with your database URI
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     GEMINI_API_KEY = '__CHANGE_LATER__'  # Update with your Gemini API key
     GEMINI_API_URL = 'https://generativelanguage.googleapis.com/v1beta'  # Update with the correct API URL
@@ -9,4 +11,31 @@ class Config:
         'protein': 50,
         'carbs': 300,
         'fats': 70
-    }
\ No newline at end of file
+    }
+    SYNC_MAX_BATCH_SIZE = 500  # Maximum number of changes accepted per /api/sync batch
+    BULK_IMPORT_CHUNK_SIZE = 5000  # Rows parsed and inserted per transaction during bulk imports
+    GEMINI_STUB_LATENCY = os.environ.get('GEMINI_STUB_LATENCY')  # Seconds; set to serve a canned model response (load testing only)
+    # Server process capacity; gunicorn.conf.py reads the same settings
+    WORKER_CLASS = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+    WORKER_THREADS = int(os.environ.get('GUNICORN_THREADS', 16))  # Request threads per server process
+    WORKER_CONNECTIONS = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 256))  # Concurrent requests per gevent worker
+    # Admission control for the food analysis endpoints (limits are per server process).
+    # Running and waiting requests both hold a request thread, so in-flight + queue
+    # may not exceed the process's request threads.
+    ADMISSION_MAX_IN_FLIGHT = None  # Analysis requests running at once; None for half the request threads
+    ADMISSION_PER_CLIENT_LIMIT = 4  # Analysis requests one user/IP may run at once
+    ADMISSION_PER_CLIENT_QUEUE = 2  # Analysis requests one user/IP may have waiting
+    ADMISSION_MAX_QUEUE = None  # Analysis requests waiting in total; None for a quarter of the request threads
+    ADMISSION_QUEUE_TIMEOUT = 2.0  # Seconds a request may wait for a slot before a 503
+    TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 0))  # Reverse proxies whose X-Forwarded-For/-Proto is trusted
+    SUGGEST_CANDIDATES = 200  # Foods kept after pruning when searching pairs and triples
+    SUGGEST_PAIR_CANDIDATES = 500  # Best pairs extended with a third food
+    STATIC_ASSET_MAX_AGE = 31536000  # Seconds fingerprinted static files may be cached (one year)
+    COMPRESS_MIN_SIZE = 1024  # JSON responses smaller than this many bytes are sent uncompressed
+    COMPRESS_LEVEL = 6  # gzip level / brotli quality for on-the-fly compression
+    PASSWORD_HASH_METHOD = 'scrypt:32768:8:1'  # scrypt:N:r:p; raise N to make hashing slower
+    PASSWORD_HASH_WORKERS = 2  # Password hashes computed at once per server process
+    PASSWORD_HASH_WAIT = 1.0  # Seconds a login may wait for a free hashing slot before a 503
+    ACCESS_TOKEN_TTL = 43200  # Seconds an access token stays valid (12 hours)
+    USER_CACHE_TTL = 60  # Seconds resolved users and goals are cached per process
+    USER_CACHE_SIZE = 4096  # Maximum number of cached users and goals per process
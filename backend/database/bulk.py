@@ -0,0 +1,413 @@
+"""
+Bulk import and export of a user's food log.
+
+Exports are generators that stream rows straight from the database, so memory
+use stays flat no matter how many years of history a user has. Imports parse
+the input in chunks and write each chunk with a single executemany statement
+inside one transaction. After an import the daily nutrition totals of every
+affected day are recomputed.
+
+Supported formats are CSV, NDJSON and Parquet (Parquet requires pyarrow).
+
+The module can also be run offline against the configured database:
+
+    python -m backend.database.bulk export --user-id 1 --format csv history.csv
+    python -m backend.database.bulk import --user-id 1 --format ndjson history.ndjson
+"""
+
+import argparse
+import csv
+import io
+import json
+import re
+import sys
+import uuid
+from itertools import islice
+from sqlalchemy import insert, update
+from backend.config import Config
+from backend.database.models import db, SyncEntry
+from backend.services.sync_service import SyncService, canonical_json, food_log_date, MAX_KEY_LENGTH
+
+FORMATS = ('csv', 'ndjson', 'parquet')
+MIMETYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet'
+}
+EXPORT_FIELDS = ('id', 'timestamp', 'name', 'calories', 'protein', 'carbs', 'fat')
+NUMERIC_FIELDS = ('calories', 'protein', 'carbs', 'fat')
+
+DEFAULT_CHUNK_SIZE = 5000
+EXPORT_BUFFER_ROWS = 1000
+
+# Gemini results use these names, older log entries use the short ones
+FIELD_ALIASES = {
+    'name': ('name', 'food_name'),
+    'carbs': ('carbs', 'carbohydrates'),
+    'fat': ('fat', 'fats')
+}
+
+
+def _to_number(value):
+    """Convert values like 12, '12.5' or '12.5g' to a float, or None."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r'-?\d+(?:\.\d+)?', str(value))
+    return float(match.group()) if match else None
+
+
+def _flatten(key, payload):
+    """Map a stored food log payload to a flat export row."""
+    row = {'id': key, 'timestamp': payload.get('timestamp')}
+    for field in ('name',) + NUMERIC_FIELDS:
+        value = None
+        for alias in FIELD_ALIASES.get(field, (field,)):
+            if payload.get(alias) not in (None, ''):
+                value = payload[alias]
+                break
+        row[field] = _to_number(value) if field in NUMERIC_FIELDS else value
+    return row
+
+
+def _iter_food_log(user_id, batch_size=EXPORT_BUFFER_ROWS):
+    """Yield (key, payload) for a user's food log without loading it all at once."""
+    query = (db.session.query(SyncEntry.key, SyncEntry.payload)
+             .filter(SyncEntry.user_id == user_id,
+                     SyncEntry.collection == 'foodLog',
+                     SyncEntry.deleted.is_(False))
+             .order_by(SyncEntry.id)
+             .yield_per(batch_size))
+    for key, payload in query:
+        yield key, json.loads(payload)
+
+
+def export_rows(user_id, fmt):
+    """
+    Stream a user's food log in the requested format.
+
+    Args:
+        user_id (int): The user whose food log is exported.
+        fmt (str): One of 'csv', 'ndjson' or 'parquet'.
+
+    Returns:
+        generator: Yields str chunks (csv, ndjson) or bytes chunks (parquet).
+
+    Raises:
+        ValueError: If the format is unknown or its dependency is missing.
+    """
+    if fmt == 'csv':
+        return _export_csv(user_id)
+    if fmt == 'ndjson':
+        return _export_ndjson(user_id)
+    if fmt == 'parquet':
+        pq, pa = _require_pyarrow()
+        return _export_parquet(user_id, pq, pa)
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _export_csv(user_id):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for count, (key, payload) in enumerate(_iter_food_log(user_id), 1):
+        writer.writerow(_flatten(key, payload))
+        if count % EXPORT_BUFFER_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _export_ndjson(user_id):
+    lines = []
+    for key, payload in _iter_food_log(user_id):
+        # Keep the full payload so micronutrients survive a round trip
+        lines.append(json.dumps({**payload, **_flatten(key, payload)}) + '\n')
+        if len(lines) == EXPORT_BUFFER_ROWS:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back in chunks."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _export_parquet(user_id, pq, pa):
+    schema = pa.schema([
+        ('id', pa.string()),
+        ('timestamp', pa.string()),
+        ('name', pa.string())
+    ] + [(field, pa.float64()) for field in NUMERIC_FIELDS])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    rows = []
+    for key, payload in _iter_food_log(user_id):
+        rows.append(_flatten(key, payload))
+        if len(rows) == EXPORT_BUFFER_ROWS:
+            # Each row group is flushed to the sink as soon as it is written
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            rows = []
+            yield sink.drain()
+    if rows:
+        writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+    writer.close()
+    yield sink.drain()
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet support requires the pyarrow package")
+    return pq, pa
+
+
+def _parse_chunks(fileobj, fmt, chunk_size):
+    """Yield lists of row dicts parsed from a binary file object."""
+    if fmt == 'parquet':
+        pq, _ = _require_pyarrow()
+        for batch in pq.ParquetFile(fileobj).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+
+    text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='')
+    if fmt == 'csv':
+        rows = csv.DictReader(text)
+    elif fmt == 'ndjson':
+        rows = (json.loads(line) for line in text if line.strip())
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    while True:
+        try:
+            chunk = list(islice(rows, chunk_size))
+        except csv.Error as e:
+            raise ValueError(f"Malformed CSV: {e}")
+        if not chunk:
+            return
+        yield chunk
+
+
+def _to_payload(row):
+    """Turn an imported row into a food log payload and its key."""
+    if not isinstance(row, dict):
+        raise ValueError("Each imported row must be an object")
+    # csv.DictReader keeps fields beyond the header under a None key
+    if not all(isinstance(k, str) for k in row):
+        raise ValueError("Each imported row must have named fields, and no more fields than the header")
+
+    payload = {k: v for k, v in row.items() if v not in (None, '')}
+    if food_log_date(payload) is None:
+        raise ValueError("Each imported row needs an ISO 8601 timestamp string")
+    flat = _flatten(None, payload)
+
+    payload.update({field: flat[field] for field in NUMERIC_FIELDS})
+    payload['name'] = flat['name']
+
+    # Rows without an id get a deterministic one so re-importing is idempotent
+    key = str(payload.get('id') or uuid.uuid5(uuid.NAMESPACE_URL, canonical_json(payload)))
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValueError("Imported ids must be at most 64 characters")
+    payload['id'] = key
+    return key, payload
+
+
+def _write_chunk(user_id, rows):
+    """Upsert one parsed chunk in a single transaction. Returns affected dates."""
+    latest = {}
+    for row in rows:
+        key, payload = _to_payload(row)
+        latest[key] = canonical_json(payload), food_log_date(payload)
+
+    existing = dict(db.session.query(SyncEntry.key, SyncEntry)
+                    .filter(SyncEntry.user_id == user_id,
+                            SyncEntry.collection == 'foodLog',
+                            SyncEntry.key.in_(list(latest)))
+                    .all())
+
+    inserts, updates, dates = [], [], set()
+    for key, (payload, date) in latest.items():
+        row = existing.get(key)
+        if row is None:
+            inserts.append({'user_id': user_id, 'collection': 'foodLog', 'key': key,
+                            'payload': payload, 'entry_date': date})
+        elif row.deleted or row.payload != payload:
+            updates.append({'id': row.id, 'payload': payload, 'deleted': False, 'entry_date': date})
+            # An entry moved to another day changes that day's totals too
+            if row.entry_date and not row.deleted:
+                dates.add(row.entry_date)
+        else:
+            continue
+        dates.add(date)
+
+    if not inserts and not updates:
+        return dates
+
+    try:
+        version = SyncService().reserve_version(user_id)
+        if inserts:
+            db.session.execute(insert(SyncEntry),
+                               [dict(values, deleted=False, version=version) for values in inserts])
+        if updates:
+            db.session.execute(update(SyncEntry),
+                               [dict(values, version=version) for values in updates])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return dates
+
+
+def recompute_daily_totals(user_id, dates):
+    """
+    Recompute the consumed totals of the given days from the food log.
+
+    Goals already saved for a day are kept; missing ones use the defaults.
+    """
+    if not dates:
+        return 0
+
+    totals = {date: dict.fromkeys(NUMERIC_FIELDS, 0.0) for date in dates}
+    # Only entries of the affected days are read, via the indexed entry_date
+    entries = (db.session.query(SyncEntry.key, SyncEntry.payload, SyncEntry.entry_date)
+               .filter(SyncEntry.user_id == user_id,
+                       SyncEntry.collection == 'foodLog',
+                       SyncEntry.deleted.is_(False),
+                       SyncEntry.entry_date.in_(list(dates)))
+               .yield_per(EXPORT_BUFFER_ROWS))
+    for key, payload, date in entries:
+        flat = _flatten(key, json.loads(payload))
+        for field in NUMERIC_FIELDS:
+            totals[date][field] += flat[field] or 0.0
+
+    saved = {row.key: json.loads(row.payload)
+             for row in SyncEntry.query.filter(SyncEntry.user_id == user_id,
+                                               SyncEntry.collection == 'nutrition',
+                                               SyncEntry.deleted.is_(False),
+                                               SyncEntry.key.in_(list(dates)))}
+    defaults = dict(Config.NUTRIENT_GOAL_DEFAULTS)
+    defaults['fat'] = defaults.pop('fats', 70)
+
+    changes = []
+    for date, consumed in totals.items():
+        day = saved.get(date, {})
+        changes.append({
+            'collection': 'nutrition',
+            'key': date,
+            'payload': {
+                field: {
+                    'consumed': round(consumed[field], 1),
+                    'goal': day.get(field, {}).get('goal', defaults.get(field))
+                }
+                for field in NUMERIC_FIELDS
+            }
+        })
+
+    sync_service = SyncService()
+    for start in range(0, len(changes), sync_service.max_batch_size):
+        sync_service.apply_changes(user_id, changes[start:start + sync_service.max_batch_size])
+    return len(changes)
+
+
+def import_rows(user_id, fileobj, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Import a food log file chunk by chunk.
+
+    Args:
+        user_id (int): The user the rows belong to.
+        fileobj (file-like): Binary file object to read from.
+        fmt (str): One of 'csv', 'ndjson' or 'parquet'.
+        chunk_size (int): Number of rows parsed and written per transaction.
+
+    Returns:
+        dict: A dictionary containing:
+            - 'rows': Number of rows read
+            - 'days': Number of days whose totals were recomputed
+
+    Raises:
+        ValueError: If the format is unknown or a row is malformed. Chunks
+                    written before the error stay committed, and the totals
+                    of their days are still recomputed.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    count = 0
+    dates = set()
+    try:
+        for chunk in _parse_chunks(fileobj, fmt, chunk_size):
+            dates |= _write_chunk(user_id, chunk)
+            count += len(chunk)
+    finally:
+        days = recompute_daily_totals(user_id, dates)
+
+    return {"rows": count, "days": days}
+
+
+def main(argv=None):
+    """Command line entry point for offline imports and exports."""
+    parser = argparse.ArgumentParser(description="Bulk import or export a user's food log")
+    parser.add_argument('command', choices=('import', 'export'))
+    parser.add_argument('path', help="File to read from or write to ('-' for stdin/stdout)")
+    parser.add_argument('--user-id', type=int, required=True)
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--database-uri', default=Config.SQLALCHEMY_DATABASE_URI)
+    args = parser.parse_args(argv)
+
+    # A bare app is enough for database access and skips the Gemini setup
+    from flask import Flask
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config['SQLALCHEMY_DATABASE_URI'] = args.database_uri
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        if args.command == 'import':
+            if args.path == '-':
+                source = sys.stdin.buffer
+            else:
+                source = open(args.path, 'rb')
+            with source:
+                result = import_rows(args.user_id, source, args.format, args.chunk_size)
+            print(f"Imported {result['rows']} rows, recomputed {result['days']} days")
+        else:
+            binary = args.format == 'parquet'
+            if args.path == '-':
+                target = sys.stdout.buffer if binary else sys.stdout
+            else:
+                target = open(args.path, 'wb' if binary else 'w', newline='' if not binary else None)
+            with target:
+                for chunk in export_rows(args.user_id, args.format):
+                    target.write(chunk)
+
+
+if __name__ == '__main__':
+    main()
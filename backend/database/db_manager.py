@@ -1,14 +1,35 @@
-# Placeholder database functions to avoid import errors
+# Database functions; the nutrient functions are still placeholders
+from sqlalchemy.exc import IntegrityError
+from backend.database.models import db, User
 
 def create_user(email, password, name=None):
-    """Placeholder for create_user function"""
-    print("Warning: using placeholder create_user function")
-    return {"email": email, "name": name, "id": 1}
+    """Create a user. `password` must already be hashed. Returns None if the email or username is taken."""
+    user = User(email=email, username=name or email, password_hash=password)
+    db.session.add(user)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return None
+    return user
 
 def get_user_by_email(email):
-    """Placeholder for get_user_by_email function"""
-    print("Warning: using placeholder get_user_by_email function")
-    return None
+    """Return the user with the given email, or None"""
+    return User.query.filter_by(email=email).first()
+
+def get_user_by_username(username):
+    """Return the user with the given username, or None"""
+    return User.query.filter_by(username=username).first()
+
+def get_user_by_id(user_id):
+    """Return the user with the given id, or None"""
+    return db.session.get(User, user_id)
+
+def update_user_password_hash(user, password_hash):
+    """Replace a user's stored password hash"""
+    user.password_hash = password_hash
+    db.session.commit()
+    return user
 
 def get_user_nutrient_goals(user_id):
     """Placeholder for get_user_nutrient_goals function"""
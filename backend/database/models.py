@@ -1,4 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
 
 db = SQLAlchemy()
 
@@ -6,7 +7,7 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128))
+    password_hash = db.Column(db.String(255))
     nutrient_goals = db.relationship('NutrientGoal', backref='user', lazy=True)
 
 class FoodItem(db.Model):
@@ -22,4 +23,26 @@ class NutrientGoal(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     goal_type = db.Column(db.String(50), nullable=False)
     target_value = db.Column(db.Float, nullable=False)
-    current_value = db.Column(db.Float, default=0.0)
\ No newline at end of file
+    current_value = db.Column(db.Float, default=0.0)
+
+class SyncEntry(db.Model):
+    """A single client-owned record (food log item or daily nutrition) kept in sync."""
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'collection', 'key'),
+        db.Index('ix_sync_entry_user_date', 'user_id', 'collection', 'entry_date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    collection = db.Column(db.String(50), nullable=False)
+    key = db.Column(db.String(64), nullable=False)
+    payload = db.Column(db.Text)
+    deleted = db.Column(db.Boolean, default=False, nullable=False)
+    entry_date = db.Column(db.String(10))  # YYYY-MM-DD of a food log entry, for per-day totals
+    version = db.Column(db.Integer, nullable=False, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SyncCursor(db.Model):
+    """Per-user monotonic version counter, bumped once per batch that changes data."""
+    user_id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
@@ -1,71 +1,72 @@
-from flask import Blueprint, request, jsonify
-from backend.database.models import User
-from backend.database.db_manager import create_user, get_user_by_email
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, request, jsonify, render_template
+from backend.database.db_manager import (create_user, get_user_by_email, get_user_by_username,
+                                         update_user_password_hash)
+from backend.utils.security import (hash_password, verify_password, needs_rehash, issue_token,
+                                    PasswordHashBusy)
 
 auth_bp = Blueprint('auth', __name__)
 
+@auth_bp.errorhandler(PasswordHashBusy)
+def password_hash_busy(e):
+    response = jsonify({'message': 'Server is busy, please try again'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
+@auth_bp.route('/login', methods=['GET'])
+def login_page():
+    """Render the login page, which stores the access token for syncing"""
+    return render_template('login.html')
+
+@auth_bp.route('/register', methods=['GET'])
+def register_page():
+    """Render the registration page"""
+    return render_template('register.html')
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     email = data.get('email')
     password = data.get('password')
 
-    if get_user_by_email(email):
+    if not email or not password:
+        return jsonify({'message': 'Email and password are required'}), 400
+
+    username = data.get('username') or email
+    if get_user_by_email(email) or get_user_by_username(username):
         return jsonify({'message': 'User already exists'}), 400
 
-    hashed_password = generate_password_hash(password, method='sha256')
-    user = create_user(email=email, password=hashed_password)
+    hashed_password = hash_password(password)
+    user = create_user(email=email, password=hashed_password, name=username)
+    if user is None:
+        # Taken by a concurrent registration since the check above
+        return jsonify({'message': 'User already exists'}), 400
 
     return jsonify({'message': 'User registered successfully', 'user_id': user.id}), 201
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     email = data.get('email')
     password = data.get('password')
 
-    user = get_user_by_email(email)
-    if not user or not check_password_hash(user.password, password):
+    user = get_user_by_email(email) if email else None
+    if not user or not password or not verify_password(user.password_hash, password):
         return jsonify({'message': 'Invalid credentials'}), 401
 
-    return jsonify({'message': 'Login successful', 'user_id': user.id}), 200
-
-from flask_sqlalchemy import SQLAlchemy
-
-db = SQLAlchemy()
-
-def init_db(app):
-    db.init_app(app)
-
-def create_record(model, **kwargs):
-    record = model(**kwargs)
-    db.session.add(record)
-    db.session.commit()
-    return record
-
-def read_record(model, record_id):
-    return model.query.get(record_id)
-
-def update_record(record, **kwargs):
-    for key, value in kwargs.items():
-        setattr(record, key, value)
-    db.session.commit()
-    return record
-
-def delete_record(record):
-    db.session.delete(record)
-    db.session.commit()
-
-# Add the functions that auth_routes is looking for
-def create_user(email, password, name=None):
-    """Placeholder for create_user function"""
-    # This is just a placeholder to prevent import errors
-    print("Warning: using placeholder create_user function")
-    return None
-
-def get_user_by_email(email):
-    """Placeholder for get_user_by_email function"""
-    # This is just a placeholder to prevent import errors
-    print("Warning: using placeholder get_user_by_email function")
-    return None
\ No newline at end of file
+    # Upgrade hashes made with older KDF settings while we have the password;
+    # the password is already verified, so skip the upgrade rather than fail when busy
+    if needs_rehash(user.password_hash):
+        try:
+            update_user_password_hash(user, hash_password(password))
+        except PasswordHashBusy:
+            pass
+
+    token, expires_in = issue_token(user.id)
+    return jsonify({
+        'message': 'Login successful',
+        'user_id': user.id,
+        'access_token': token,
+        'token_type': 'Bearer',
+        'expires_in': expires_in
+    }), 200
@@ -0,0 +1,41 @@
+from flask import Blueprint, request, jsonify, Response, stream_with_context, current_app, g
+from backend.database.bulk import FORMATS, MIMETYPES, export_rows, import_rows
+from backend.utils.security import token_required
+
+data_bp = Blueprint('data', __name__)
+
+
+@data_bp.route('/api/food-log/export', methods=['GET'])
+@token_required
+def export_food_log():
+    """Stream the user's whole food log as CSV, NDJSON or Parquet"""
+    fmt = request.args.get('format', 'csv')
+
+    try:
+        rows = export_rows(g.user_id, fmt)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    response = Response(stream_with_context(rows), mimetype=MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename=food_log.{fmt}'
+    return response
+
+
+@data_bp.route('/api/food-log/import', methods=['POST'])
+@token_required
+def import_food_log():
+    """Bulk import a food log file uploaded as 'file'"""
+    fmt = request.form.get('format', 'csv')
+
+    if 'file' not in request.files:
+        return jsonify({'error': 'A file is required'}), 400
+    if fmt not in FORMATS:
+        return jsonify({'error': f'Unsupported format: {fmt}'}), 400
+
+    chunk_size = current_app.config.get('BULK_IMPORT_CHUNK_SIZE', 5000)
+    try:
+        result = import_rows(g.user_id, request.files['file'].stream, fmt, chunk_size)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify(result), 200
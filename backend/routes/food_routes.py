@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app, render_template
-from backend.services.gemini_service import GeminiService
-import os
+from backend.utils.admission import admit_request, release_request
 
 food_routes = Blueprint('food_routes', __name__)
 
+# Limit concurrent analysis requests globally and per client
+food_routes.before_request(admit_request)
+food_routes.teardown_request(release_request)
+
 # Simplified routes without database dependencies
 @food_routes.route('/api/food/analyze-text', methods=['POST'])
 def analyze_text():
@@ -15,12 +18,9 @@ def analyze_text():
     
     food_description = data['text']
     
-    # Get API key from config
-    api_key = current_app.config.get('GEMINI_API_KEY')
-    
-    # Initialize Gemini service
+    # Use the shared Gemini service created at startup
     try:
-        gemini_service = GeminiService(api_key)
+        gemini_service = current_app.extensions['gemini_service']
         result = gemini_service.analyze_food_text(food_description)
         
         if result["success"]:
@@ -47,12 +47,9 @@ def analyze_image():
     if not file.filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')):
         return jsonify({"error": "File must be an image"}), 400
         
-    # Get API key from environment
-    api_key = os.environ.get('GEMINI_API_KEY')
-    
-    # Initialize Gemini service
+    # Use the shared Gemini service created at startup
     try:
-        gemini_service = GeminiService(api_key)
+        gemini_service = current_app.extensions['gemini_service']
         result = gemini_service.analyze_food_image(file)
         
         if result["success"]:
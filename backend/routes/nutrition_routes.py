@@ -0,0 +1,36 @@
+import math
+from flask import Blueprint, request, jsonify, current_app
+from backend.services.suggestion_service import SuggestionService, NUTRIENTS
+
+nutrition_bp = Blueprint('nutrition', __name__)
+
+
+@nutrition_bp.route('/api/nutrition/suggest', methods=['GET', 'POST'])
+def suggest_foods():
+    """Suggest 1-3 foods that best close today's remaining nutrient gap"""
+    data = request.get_json(silent=True) if request.method == 'POST' else request.args
+    data = data or {}
+
+    remaining = {}
+    for nutrient in NUTRIENTS:
+        try:
+            value = float(data[nutrient])
+        except (KeyError, TypeError, ValueError):
+            value = math.nan
+        # float() accepts 'inf' and 'nan', which JSON can't represent
+        if not math.isfinite(value):
+            return jsonify({'error': f'Remaining {nutrient} must be a number'}), 400
+        remaining[nutrient] = max(0.0, value)
+
+    try:
+        limit = min(int(data.get('limit', 5)), 20)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Limit must be a number'}), 400
+
+    suggestion_service = SuggestionService(
+        candidates=current_app.config.get('SUGGEST_CANDIDATES', 200),
+        pair_candidates=current_app.config.get('SUGGEST_PAIR_CANDIDATES', 500)
+    )
+    suggestions = suggestion_service.suggest(remaining, limit=max(limit, 1))
+
+    return jsonify({'remaining': remaining, 'suggestions': suggestions}), 200
@@ -0,0 +1,71 @@
+from flask import Blueprint, request, jsonify, current_app, g
+from backend.services.sync_service import SyncService
+from backend.utils.security import token_required
+
+sync_bp = Blueprint('sync', __name__)
+
+
+def _get_sync_service():
+    return SyncService(current_app.config.get('SYNC_MAX_BATCH_SIZE', 500))
+
+
+@sync_bp.route('/api/sync', methods=['GET'])
+@token_required
+def get_changes():
+    """Return entries changed since the client's last known version"""
+    user_id = g.user_id
+    since = request.args.get('since', default=0, type=int)
+
+    sync_service = _get_sync_service()
+
+    # The version only moves forward, so (since, version) identifies the response
+    version = sync_service.get_version(user_id)
+    etag = f"{user_id}-{since}-{version}"
+    # Weak match, since compressed responses carry a weak ETag
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
+    response = jsonify(sync_service.get_changes(user_id, since))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@sync_bp.route('/api/sync', methods=['POST'])
+@token_required
+def push_changes():
+    """Apply a batch of idempotent upserts and deletions from the client"""
+    data = request.get_json(silent=True) or {}
+    changes = data.get('changes')
+
+    if changes is None:
+        return jsonify({'error': 'Changes are required'}), 400
+
+    try:
+        result = _get_sync_service().apply_changes(g.user_id, changes)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify(result), 200
+
+
+@sync_bp.route('/api/nutrition/save', methods=['POST'])
+@token_required
+def save_nutrition():
+    """Save one day of dashboard nutrition data as a single sync change"""
+    data = request.get_json(silent=True) or {}
+    date = data.get('date')
+    nutrition = data.get('data')
+
+    if not date or not isinstance(nutrition, dict):
+        return jsonify({'success': False, 'error': 'Date and data are required'}), 400
+
+    change = {'collection': 'nutrition', 'key': date, 'payload': nutrition}
+    try:
+        result = _get_sync_service().apply_changes(g.user_id, [change])
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    return jsonify({'success': True, 'version': result['version']}), 200
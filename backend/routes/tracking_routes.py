@@ -1,42 +1,42 @@
-from flask import Blueprint, request, jsonify
+from datetime import date
+from flask import Blueprint, request, jsonify, g
 from ..services.nutrient_service import NutrientService
+from ..utils.security import token_required, get_cached_goals, invalidate_user_cache
 
 tracking_bp = Blueprint('tracking', __name__)
 
 @tracking_bp.route('/track', methods=['POST'])
+@token_required
 def track_nutrients():
-    data = request.json
-    user_id = data.get('user_id')
+    data = request.get_json(silent=True) or {}
     food_items = data.get('food_items')
 
-    if not user_id or not food_items:
-        return jsonify({'error': 'User ID and food items are required'}), 400
+    if not food_items:
+        return jsonify({'error': 'Food items are required'}), 400
 
     nutrient_service = NutrientService()
-    result = nutrient_service.track_nutrients(user_id, food_items)
+    result = nutrient_service.update_progress(g.user_id, food_items)
+    invalidate_user_cache(g.user_id)
 
-    return jsonify(result), 200
+    return jsonify({'success': bool(result)}), 200
 
 @tracking_bp.route('/goals', methods=['GET'])
+@token_required
 def get_nutrient_goals():
-    user_id = request.args.get('user_id')
-
-    if not user_id:
-        return jsonify({'error': 'User ID is required'}), 400
-
-    nutrient_service = NutrientService()
-    goals = nutrient_service.get_nutrient_goals(user_id)
-
-    return jsonify(goals), 200
+    return jsonify(get_cached_goals(g.user_id)), 200
 
 @tracking_bp.route('/progress', methods=['GET'])
+@token_required
 def get_progress():
-    user_id = request.args.get('user_id')
-
-    if not user_id:
-        return jsonify({'error': 'User ID is required'}), 400
+    # The client's local date, since "today" depends on the user's time zone
+    day = request.args.get('date')
+    if day is not None:
+        try:
+            day = date.fromisoformat(day).isoformat()
+        except ValueError:
+            return jsonify({'error': 'Date must be YYYY-MM-DD'}), 400
 
     nutrient_service = NutrientService()
-    progress = nutrient_service.get_progress(user_id)
+    progress = nutrient_service.get_progress(g.user_id, get_cached_goals(g.user_id), day)
 
-    return jsonify(progress), 200
\ No newline at end of file
+    return jsonify(progress), 200
@@ -22,6 +22,7 @@ from PIL import Image
 from io import BytesIO
 import json
 import re
+import time
 
 class GeminiService:
     """
@@ -49,6 +50,15 @@ class GeminiService:
         # Configure the Gemini API with the provided API key
         genai.configure(api_key=self.api_key)
     
+    def reconnect(self):
+        """
+        Re-create the underlying API clients.
+        
+        Clients created before a fork must not be shared with the child
+        process, so preloaded server workers call this right after forking.
+        """
+        genai.configure(api_key=self.api_key)
+    
     def test_api_key(self):
         """
         Test if the API key is valid by making a simple request.
@@ -312,3 +322,48 @@ class GeminiService:
                 "success": False,
                 "error": str(e)
             }
+
+
+class StubGeminiService:
+    """
+    Stand-in for GeminiService that returns a canned analysis after a delay.
+    
+    Used for load testing the server without calling the real API. The delay
+    mimics the time a worker spends waiting on the model.
+    """
+    
+    STUB_RESPONSE = json.dumps({
+        "food_name": "Stub Apple",
+        "portion_size": "1 medium",
+        "calories": 95,
+        "protein": "0.5g",
+        "carbohydrates": "25g",
+        "fat": "0.3g",
+        "fiber": "4g",
+        "vitamins_and_minerals": {"vitamin_c": "8 mg", "potassium": "195 mg"},
+        "potential_allergens": [],
+        "health_assessment": "Canned response from the stub Gemini service."
+    })
+    
+    def __init__(self, latency=0.5):
+        """
+        Initialize the stub service.
+        
+        Args:
+            latency (float): Seconds to wait before each response.
+        """
+        self.latency = latency
+    
+    def reconnect(self):
+        """No clients to re-create."""
+    
+    def test_api_key(self):
+        return True
+    
+    def analyze_food_text(self, food_description):
+        time.sleep(self.latency)
+        return {"success": True, "data": self.STUB_RESPONSE}
+    
+    def analyze_food_image(self, image_file):
+        time.sleep(self.latency)
+        return {"success": True, "data": self.STUB_RESPONSE}
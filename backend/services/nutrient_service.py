@@ -1,4 +1,7 @@
-# Placeholder nutrient service to avoid import errors
+# Placeholder nutrient service to avoid import errors; progress is read from synced data
+import json
+from datetime import date
+from backend.database.models import SyncEntry
 
 class NutrientService:
     def __init__(self):
@@ -18,6 +21,34 @@ class NutrientService:
         """Update a user's progress toward their nutrient goals"""
         return True
     
+    def get_progress(self, user_id, goals=None, day=None):
+        """
+        Get a user's progress toward each of their nutrient goals on one day.
+
+        Progress is the amount consumed in the day's synced dashboard
+        nutrition entry; nutrients without an entry count as 0.
+
+        Args:
+            user_id (int): The user's ID
+            goals (dict, optional): Goals to report against; the user's goals by default
+            day (str, optional): YYYY-MM-DD date; today by default
+
+        Returns:
+            dict: {nutrient: {"current": amount, "goal": goal}}
+        """
+        goals = goals or self.get_user_goals(user_id)
+        entry = SyncEntry.query.filter_by(user_id=user_id, collection='nutrition',
+                                          key=day or date.today().isoformat(), deleted=False).first()
+        consumed = json.loads(entry.payload) if entry else {}
+
+        progress = {}
+        for nutrient, goal in goals.items():
+            amount = consumed.get(nutrient)
+            if isinstance(amount, dict):
+                amount = amount.get('consumed')
+            progress[nutrient] = {"current": amount if isinstance(amount, (int, float)) else 0, "goal": goal}
+        return progress
+    
     def analyze_food(self, food_data):
         """Analyze food data and return nutritional information"""
         return {"calories": 100, "protein": 10, "carbs": 15, "fat": 5}
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Suggestion Service Module
+
+This module suggests foods from the local FoodItem table that close the gap
+between what a user has eaten today and their nutrient goals.
+
+Foods are held in a NumPy matrix (one row per food, one column per nutrient)
+that is built once and reused until the table changes. Every combination of
+one to three foods is scored by its weighted distance to the remaining
+calories, protein, carbs and fat. Since nutrients only add up, a food that on
+its own overshoots the target by more than the best single food misses it can
+never be part of a better combination, so such foods are dropped up front.
+Pairs and triples are then searched among the most promising remaining foods
+with vectorized scoring, which keeps a request in the tens of milliseconds even
+with tens of thousands of foods.
+"""
+
+import threading
+import numpy as np
+from sqlalchemy import func
+from backend.config import Config
+from backend.database.models import db, FoodItem
+
+NUTRIENTS = ('calories', 'protein', 'carbs', 'fat')
+FOOD_COLUMNS = (FoodItem.calories, FoodItem.protein, FoodItem.carbohydrates, FoodItem.fats)
+
+
+class SuggestionService:
+    """
+    Service class for finding food combinations that match remaining macros.
+    """
+
+    _lock = threading.Lock()
+    _cache = None
+
+    def __init__(self, candidates=200, pair_candidates=500):
+        """
+        Initialize the suggestion service.
+
+        Args:
+            candidates (int): Foods considered for pairs and triples after pruning.
+            pair_candidates (int): Best pairs extended with a third food.
+        """
+        self.candidates = candidates
+        self.pair_candidates = pair_candidates
+
+        # Score each nutrient relative to its default daily goal, so that
+        # 10 kcal and 10 g of protein are not treated as the same miss
+        defaults = dict(Config.NUTRIENT_GOAL_DEFAULTS)
+        defaults['fat'] = defaults.pop('fats', 70)
+        self.weights = 1.0 / np.array([defaults[n] for n in NUTRIENTS], dtype=np.float64)
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the cached food matrix, e.g. after editing existing foods."""
+        with cls._lock:
+            cls._cache = None
+
+    def _load_foods(self):
+        """Return (ids, names, matrix) for all foods, rebuilding only when the table changed."""
+        signature = db.session.query(func.count(FoodItem.id), func.max(FoodItem.id)).one()
+        signature = tuple(signature)
+
+        cache = SuggestionService._cache
+        if cache is not None and cache[0] == signature:
+            return cache[1]
+
+        with SuggestionService._lock:
+            cache = SuggestionService._cache
+            if cache is not None and cache[0] == signature:
+                return cache[1]
+
+            rows = db.session.query(FoodItem.id, FoodItem.name, *FOOD_COLUMNS).all()
+            ids = np.array([row[0] for row in rows], dtype=np.int64)
+            names = [row[1] for row in rows]
+            matrix = np.array([row[2:] for row in rows], dtype=np.float64).reshape(-1, len(NUTRIENTS))
+            foods = (ids, names, matrix)
+            SuggestionService._cache = (signature, foods)
+            return foods
+
+    def suggest(self, remaining, limit=5):
+        """
+        Suggest the food combinations that best match the remaining nutrients.
+
+        Args:
+            remaining (dict): Remaining 'calories', 'protein', 'carbs' and 'fat'.
+            limit (int): Maximum number of suggestions to return.
+
+        Returns:
+            list: Suggestions, best first, each a dict containing:
+                - 'foods': The 1-3 foods in the combination
+                - 'totals': Summed nutrients of the combination
+                - 'score': Weighted distance to the target (lower is better)
+        """
+        ids, names, matrix = self._load_foods()
+        if len(ids) == 0:
+            return []
+
+        target = np.array([remaining[n] for n in NUTRIENTS], dtype=np.float64)
+        weighted = matrix * self.weights
+        goal = target * self.weights
+
+        singles = np.linalg.norm(weighted - goal, axis=1)
+
+        # Overshoot of a single food is a lower bound for any combination containing it
+        overshoot = np.linalg.norm(np.maximum(weighted - goal, 0), axis=1)
+        keep = np.flatnonzero(overshoot <= singles.min())
+
+        # Rank what is left by how well each food fits as one half or one third of the target
+        fit = np.minimum(singles[keep], np.minimum(
+            np.linalg.norm(weighted[keep] - goal / 2, axis=1),
+            np.linalg.norm(weighted[keep] - goal / 3, axis=1)))
+        if len(keep) > self.candidates:
+            keep = keep[np.argpartition(fit, self.candidates)[:self.candidates]]
+        keep.sort()
+
+        results = [(singles[i], (i,)) for i in np.argsort(singles)[:limit]]
+
+        if len(keep) >= 2:
+            cand = weighted[keep]
+            first, second = np.triu_indices(len(keep), k=1)
+            pair_sums = cand[first] + cand[second]
+            pair_scores = np.linalg.norm(pair_sums - goal, axis=1)
+
+            best = np.argsort(pair_scores)[:limit]
+            results += [(pair_scores[p], (keep[first[p]], keep[second[p]])) for p in best]
+
+            if len(keep) >= 3:
+                top = np.argsort(pair_scores)[:self.pair_candidates]
+                # Extend each good pair with every later candidate so each triple is seen once
+                third = np.arange(len(keep))
+                valid = third[None, :] > second[top][:, None]
+                triple_scores = np.linalg.norm(
+                    pair_sums[top][:, None, :] + cand[None, :, :] - goal, axis=2)
+                triple_scores = np.where(valid, triple_scores, np.inf)
+
+                flat = triple_scores.ravel()
+                count = min(limit, int(np.isfinite(flat).sum()))
+                if count:
+                    best = np.argpartition(flat, count - 1)[:count]
+                    for index in best:
+                        p, k = divmod(int(index), len(keep))
+                        results.append((flat[index], (keep[first[top[p]]], keep[second[top[p]]], keep[k])))
+
+        results.sort(key=lambda result: result[0])
+        return [self._describe(ids, names, matrix, combo, score) for score, combo in results[:limit]]
+
+    @staticmethod
+    def _describe(ids, names, matrix, combo, score):
+        foods = [{
+            "id": int(ids[i]),
+            "name": names[i],
+            **{n: float(v) for n, v in zip(NUTRIENTS, matrix[i])}
+        } for i in combo]
+        totals = matrix[list(combo)].sum(axis=0)
+        return {
+            "foods": foods,
+            "totals": {n: round(float(v), 1) for n, v in zip(NUTRIENTS, totals)},
+            "score": round(float(score), 4)
+        }
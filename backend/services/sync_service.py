@@ -0,0 +1,209 @@
+"""
+Sync Service Module
+
+This module implements the incremental sync protocol used by the frontend to
+mirror its locally stored food log and daily nutrition data on the server.
+
+Every user has a monotonic version counter. Each batch of changes that actually
+modifies data bumps the counter once, and every entry touched by the batch is
+stamped with the new version. Clients remember the last version they saw and
+ask only for entries with a higher version, so a sync costs as much as the
+change rather than the whole history.
+"""
+
+import json
+from datetime import date
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from backend.database.models import db, SyncEntry, SyncCursor
+
+SYNC_COLLECTIONS = ('foodLog', 'nutrition')
+MAX_KEY_LENGTH = 64
+
+
+def food_log_date(payload):
+    """Return the YYYY-MM-DD date of a food log payload's timestamp, or None."""
+    timestamp = payload.get('timestamp')
+    if not isinstance(timestamp, str):
+        return None
+    try:
+        return date.fromisoformat(timestamp[:10]).isoformat()
+    except ValueError:
+        return None
+
+
+def canonical_json(payload):
+    """Serialize a payload so that identical data always produces identical text."""
+    return json.dumps(payload, sort_keys=True, separators=(',', ':'))
+
+
+class SyncService:
+    """
+    Service class for reading and applying incremental sync changes.
+    """
+
+    def __init__(self, max_batch_size=500):
+        """
+        Initialize the sync service.
+
+        Args:
+            max_batch_size (int): Maximum number of changes accepted per batch.
+        """
+        self.max_batch_size = max_batch_size
+
+    def get_version(self, user_id):
+        """
+        Return the user's current sync version (0 if nothing was ever synced).
+        """
+        cursor = db.session.get(SyncCursor, user_id)
+        return cursor.version if cursor else 0
+
+    def get_changes(self, user_id, since=0):
+        """
+        Get all entries changed after a given version.
+
+        Args:
+            user_id (int): The user whose entries are requested.
+            since (int): The last version the client has seen.
+
+        Returns:
+            dict: A dictionary containing:
+                - 'version': The user's current version
+                - 'changes': List of changed entries, oldest first
+        """
+        entries = (SyncEntry.query
+                   .filter(SyncEntry.user_id == user_id, SyncEntry.version > since)
+                   .order_by(SyncEntry.version, SyncEntry.id)
+                   .all())
+        return {
+            "version": self.get_version(user_id),
+            "changes": [self._serialize(entry) for entry in entries]
+        }
+
+    def apply_changes(self, user_id, changes):
+        """
+        Apply a batch of upserts and deletions in a single transaction.
+
+        Re-sending a change that is already stored is a no-op, so clients can
+        safely retry a batch after a network failure.
+
+        Args:
+            user_id (int): The user the changes belong to.
+            changes (list): Items with 'collection', 'key' and either a
+                            'payload' dict or 'deleted': true.
+
+        Returns:
+            dict: A dictionary containing:
+                - 'version': The user's version after the batch
+                - 'applied': Number of entries that actually changed
+
+        Raises:
+            ValueError: If the batch is too large or an item is malformed.
+        """
+        if not isinstance(changes, list):
+            raise ValueError("changes must be a list")
+        if len(changes) > self.max_batch_size:
+            raise ValueError(f"At most {self.max_batch_size} changes are allowed per batch")
+
+        normalized = [self._normalize(change) for change in changes]
+
+        # Collapse repeated keys within the batch to their last write
+        latest = {}
+        for change in normalized:
+            latest[(change['collection'], change['key'])] = change
+
+        existing = {}
+        if latest:
+            keys = [key for _, key in latest]
+            rows = SyncEntry.query.filter(SyncEntry.user_id == user_id,
+                                          SyncEntry.key.in_(keys)).all()
+            existing = {(row.collection, row.key): row for row in rows}
+
+        pending = []
+        for ident, change in latest.items():
+            row = existing.get(ident)
+            if row is not None and row.deleted == change['deleted'] and row.payload == change['payload']:
+                continue
+            if row is None and change['deleted']:
+                continue
+            pending.append((row, change))
+
+        if not pending:
+            return {"version": self.get_version(user_id), "applied": 0}
+
+        try:
+            version = self.reserve_version(user_id)
+            for row, change in pending:
+                if row is None:
+                    row = SyncEntry(user_id=user_id,
+                                    collection=change['collection'],
+                                    key=change['key'])
+                    db.session.add(row)
+                row.payload = change['payload']
+                row.deleted = change['deleted']
+                row.entry_date = change['entry_date']
+                row.version = version
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return {"version": version, "applied": len(pending)}
+
+    def reserve_version(self, user_id):
+        """
+        Atomically bump and return the user's version counter.
+
+        The caller is responsible for committing the surrounding transaction.
+        """
+        result = db.session.execute(
+            update(SyncCursor)
+            .where(SyncCursor.user_id == user_id)
+            .values(version=SyncCursor.version + 1)
+        )
+        if result.rowcount == 0:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(SyncCursor(user_id=user_id, version=1))
+                return 1
+            except IntegrityError:
+                # A concurrent first batch created the cursor; bump that one instead
+                return self.reserve_version(user_id)
+        return db.session.get(SyncCursor, user_id, populate_existing=True).version
+
+    def _normalize(self, change):
+        """Validate a client change and convert its payload to canonical JSON."""
+        if not isinstance(change, dict):
+            raise ValueError("Each change must be an object")
+
+        collection = change.get('collection')
+        if collection not in SYNC_COLLECTIONS:
+            raise ValueError(f"Unknown collection: {collection}")
+
+        key = change.get('key')
+        if not isinstance(key, str) or not key or len(key) > MAX_KEY_LENGTH:
+            raise ValueError("Each change needs a key of at most 64 characters")
+
+        deleted = bool(change.get('deleted', False))
+        payload = None
+        entry_date = None
+        if not deleted:
+            if not isinstance(change.get('payload'), dict):
+                raise ValueError("Each change needs a payload object unless deleted")
+            # Canonical text makes identical payloads compare equal for idempotency
+            payload = canonical_json(change['payload'])
+            if collection == 'foodLog':
+                entry_date = food_log_date(change['payload'])
+
+        return {"collection": collection, "key": key, "payload": payload,
+                "deleted": deleted, "entry_date": entry_date}
+
+    @staticmethod
+    def _serialize(entry):
+        return {
+            "collection": entry.collection,
+            "key": entry.key,
+            "payload": json.loads(entry.payload) if entry.payload else None,
+            "deleted": entry.deleted,
+            "version": entry.version
+        }
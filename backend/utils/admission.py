@@ -0,0 +1,250 @@
+"""
+Admission control for the expensive food analysis endpoints.
+
+Each analysis request holds a worker thread for as long as Gemini takes to
+answer, so a single client sending many photos at once can occupy every
+thread. The controller caps the number of requests in flight per process and
+per client. Requests over the global limit wait in a fair queue, where waiting
+clients are served round-robin rather than first-come-first-served, so a
+client with many queued requests cannot starve the others. Waiting is bounded:
+requests that cannot be admitted in time are rejected quickly with a
+Retry-After hint instead of piling up.
+
+Limits apply per server process; with several workers the effective global
+limit is the per-process limit times the number of workers. Waiting requests
+hold a request thread just like running ones, so unless configured otherwise
+the limits are derived from the process's request threads: half may run
+analyses, a quarter may wait, and the rest stay free for other endpoints.
+
+Clients are identified by the user of a verified access token, or by IP
+address for anonymous requests; ids supplied by the client are never trusted.
+Behind reverse proxies, set TRUSTED_PROXY_COUNT to the number of proxies so the
+address comes from X-Forwarded-For rather than being the proxy's for everyone.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from flask import current_app, g, jsonify, request
+from werkzeug.middleware.proxy_fix import ProxyFix
+from backend.utils.security import token_user_id
+
+ADMISSION_ENDPOINTS = ('food_routes.analyze_text', 'food_routes.analyze_image')
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted."""
+
+    def __init__(self, status, message, retry_after):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ('event', 'granted')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class AdmissionController:
+    """
+    Global and per-client concurrency limiter with a round-robin wait queue.
+    """
+
+    def __init__(self, max_in_flight=8, per_client_limit=4, per_client_queue=2,
+                 max_queue=4, queue_timeout=2.0):
+        """
+        Initialize the admission controller.
+
+        Args:
+            max_in_flight (int): Requests allowed to run at once.
+            per_client_limit (int): Requests one client may have running at once.
+            per_client_queue (int): Requests one client may have waiting.
+            max_queue (int): Requests allowed to wait in total.
+            queue_timeout (float): Seconds a request may wait before being rejected.
+        """
+        self.max_in_flight = max_in_flight
+        self.per_client_limit = per_client_limit
+        self.per_client_queue = per_client_queue
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = {}
+        self._queues = OrderedDict()
+        self._queued = 0
+        self._service_time = 1.0
+
+    def acquire(self, client):
+        """
+        Admit a request for `client`, waiting in the fair queue if necessary.
+
+        Raises:
+            AdmissionRejected: With status 429 if the client is over its own
+                               limits, or 503 if the server is over capacity.
+        """
+        with self._lock:
+            running = self._running.get(client, 0)
+            queue = self._queues.get(client)
+            waiting = len(queue) if queue else 0
+
+            if self._queued == 0 and self._in_flight < self.max_in_flight and running < self.per_client_limit:
+                self._admit(client)
+                return
+
+            if waiting >= self.per_client_queue:
+                raise AdmissionRejected(429, "Too many concurrent requests", self._retry_after())
+            if self._queued >= self.max_queue:
+                raise AdmissionRejected(503, "Server is busy", self._retry_after())
+
+            waiter = _Waiter()
+            self._queues.setdefault(client, deque()).append(waiter)
+            self._queued += 1
+            # Free slots may be held back only for clients at their own limit
+            self._dispatch()
+
+        if not waiter.granted:
+            waiter.event.wait(self.queue_timeout)
+
+        with self._lock:
+            if waiter.granted:
+                return
+            queue = self._queues[client]
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[client]
+            self._queued -= 1
+            raise AdmissionRejected(503, "Server is busy", self._retry_after())
+
+    def release(self, client, elapsed=None):
+        """Mark a request as finished and hand its slot to the next waiter."""
+        with self._lock:
+            self._in_flight -= 1
+            self._running[client] -= 1
+            if not self._running[client]:
+                del self._running[client]
+            if elapsed is not None:
+                # Moving average of request time, used for Retry-After hints
+                self._service_time = 0.9 * self._service_time + 0.1 * elapsed
+            self._dispatch()
+
+    def _admit(self, client):
+        self._in_flight += 1
+        self._running[client] = self._running.get(client, 0) + 1
+
+    def _dispatch(self):
+        """Grant free slots to waiting clients in round-robin order."""
+        skipped = 0
+        while self._in_flight < self.max_in_flight and skipped < len(self._queues):
+            client, queue = next(iter(self._queues.items()))
+            # Move the client to the back so the others get the next turn
+            self._queues.move_to_end(client)
+            if self._running.get(client, 0) >= self.per_client_limit:
+                skipped += 1
+                continue
+
+            waiter = queue.popleft()
+            if not queue:
+                del self._queues[client]
+            self._queued -= 1
+            self._admit(client)
+            waiter.granted = True
+            waiter.event.set()
+            skipped = 0
+
+    def _retry_after(self):
+        backlog = (self._queued + self._in_flight) / max(self.max_in_flight, 1)
+        return max(1, math.ceil(self._service_time * backlog))
+
+
+def _client_key():
+    """Identify the caller by verified token user, otherwise by IP address."""
+    user_id = token_user_id()
+    if user_id is not None:
+        return f"user:{user_id}"
+    return f"ip:{request.remote_addr}"
+
+
+def admission_limits(config):
+    """
+    Return the (max_in_flight, max_queue) limits for a server process.
+
+    Limits left unset are derived from the request threads of a worker
+    (or its connections, for gevent workers).
+
+    Raises:
+        ValueError: If running plus waiting requests could exceed the
+                    process's request threads.
+    """
+    if config.get('WORKER_CLASS') == 'gevent':
+        capacity = config.get('WORKER_CONNECTIONS', 256)
+    else:
+        capacity = config.get('WORKER_THREADS', 16)
+
+    max_in_flight = config.get('ADMISSION_MAX_IN_FLIGHT')
+    if max_in_flight is None:
+        max_in_flight = max(1, capacity // 2)
+    max_queue = config.get('ADMISSION_MAX_QUEUE')
+    if max_queue is None:
+        max_queue = max(0, min(capacity // 4, capacity - max_in_flight))
+
+    if max_in_flight + max_queue > capacity:
+        raise ValueError(
+            f"ADMISSION_MAX_IN_FLIGHT ({max_in_flight}) + ADMISSION_MAX_QUEUE ({max_queue}) "
+            f"exceeds the {capacity} request threads per server process")
+    return max_in_flight, max_queue
+
+
+def init_admission(app):
+    """
+    Create the app's admission controller from its configuration.
+
+    With TRUSTED_PROXY_COUNT set, the app also takes the client address from
+    that many X-Forwarded-For hops, so anonymous callers are told apart.
+    """
+    proxies = app.config.get('TRUSTED_PROXY_COUNT', 0)
+    if proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
+
+    max_in_flight, max_queue = admission_limits(app.config)
+    app.extensions['admission_controller'] = AdmissionController(
+        max_in_flight=max_in_flight,
+        per_client_limit=app.config.get('ADMISSION_PER_CLIENT_LIMIT', 4),
+        per_client_queue=app.config.get('ADMISSION_PER_CLIENT_QUEUE', 2),
+        max_queue=max_queue,
+        queue_timeout=app.config.get('ADMISSION_QUEUE_TIMEOUT', 2.0)
+    )
+
+
+def admit_request():
+    """before_request hook that admits or rejects analysis requests."""
+    controller = current_app.extensions.get('admission_controller')
+    if controller is None or request.endpoint not in ADMISSION_ENDPOINTS:
+        return None
+
+    client = _client_key()
+    try:
+        controller.acquire(client)
+    except AdmissionRejected as e:
+        response = jsonify({"error": e.message})
+        response.status_code = e.status
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+
+    g.admission_client = client
+    g.admission_started = time.monotonic()
+    return None
+
+
+def release_request(exc):
+    """teardown_request hook that frees the slot taken by admit_request."""
+    client = g.pop('admission_client', None)
+    if client is not None:
+        elapsed = time.monotonic() - g.pop('admission_started')
+        current_app.extensions['admission_controller'].release(client, elapsed)
@@ -0,0 +1,153 @@
+"""
+Fingerprinted, precompressed static assets.
+
+`python -m backend.utils.assets` copies every file in frontend/static to
+frontend/static/build with a content hash in its name (css/main.css becomes
+build/css/main.1a2b3c4d5e6f.css), writes gzip and brotli versions of text
+files next to them, and records the mapping in build/manifest.json.
+
+At runtime the manifest is loaded once. Templates get a `url_for` that
+rewrites static filenames to their hashed names, and hashed files are served
+with long-lived immutable cache headers, picking the precompressed variant the
+browser accepts. A hashed name changes whenever the content does, so browsers
+never need to revalidate them. Without a build, the original files are served
+as before.
+
+Brotli output requires the brotli package; without it only gzip is written.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import sys
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BUILD_DIR = 'build'
+MANIFEST_NAME = 'manifest.json'
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.json', '.svg', '.html', '.txt', '.ico')
+# Preferred first; the browser must accept the encoding and the file must exist
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _hashed_name(path, digest):
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest[:12]}{ext}"
+
+
+def build_assets(static_folder):
+    """
+    Write fingerprinted and precompressed copies of all static files.
+
+    Args:
+        static_folder (str): The app's static folder.
+
+    Returns:
+        dict: Manifest mapping original filenames to hashed ones, both
+              relative to the static folder.
+    """
+    build_folder = os.path.join(static_folder, BUILD_DIR)
+    if os.path.isdir(build_folder):
+        shutil.rmtree(build_folder)
+
+    manifest = {}
+    for directory, subdirs, files in os.walk(static_folder):
+        if os.path.abspath(directory) == os.path.abspath(static_folder):
+            subdirs[:] = [d for d in subdirs if d != BUILD_DIR]
+
+        for filename in sorted(files):
+            source = os.path.join(directory, filename)
+            relative = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                content = f.read()
+
+            hashed = f"{BUILD_DIR}/{_hashed_name(relative, hashlib.sha256(content).hexdigest())}"
+            target = os.path.join(static_folder, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(content)
+
+            if relative.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+                # mtime=0 keeps gzip output identical across builds
+                with open(target + '.gz', 'wb') as f:
+                    f.write(gzip.compress(content, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    with open(target + '.br', 'wb') as f:
+                        f.write(brotli.compress(content, quality=11))
+
+            manifest[relative] = hashed
+
+    with open(os.path.join(build_folder, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(static_folder):
+    """Return the build manifest, or an empty one if assets were not built."""
+    try:
+        with open(os.path.join(static_folder, BUILD_DIR, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def asset_url_for(endpoint, **values):
+    """url_for that points static files at their fingerprinted build."""
+    if endpoint == 'static':
+        manifest = current_app.extensions.get('asset_manifest', {})
+        filename = values.get('filename')
+        if filename in manifest:
+            values['filename'] = manifest[filename]
+    return url_for(endpoint, **values)
+
+
+def serve_static(filename):
+    """Static view that serves hashed files precompressed and cached for a year."""
+    # Only names listed in the manifest are fingerprinted; anything else under
+    # build/ (such as the manifest itself) can change without changing its name
+    if filename not in current_app.extensions.get('asset_files', ()):
+        return current_app.send_static_file(filename)
+
+    static_folder = current_app.static_folder
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    max_age = current_app.config.get('STATIC_ASSET_MAX_AGE', 31536000)
+
+    encoding = None
+    path = filename
+    for candidate, extension in PRECOMPRESSED:
+        if request.accept_encodings[candidate] and os.path.isfile(
+                os.path.join(static_folder, filename + extension)):
+            encoding, path = candidate, filename + extension
+            break
+
+    response = send_from_directory(static_folder, path, mimetype=mimetype, max_age=max_age)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.cache_control.immutable = True
+    return response
+
+
+def init_assets(app):
+    """Load the asset manifest and route static files and template URLs through it."""
+    app.extensions['asset_manifest'] = load_manifest(app.static_folder)
+    app.extensions['asset_files'] = frozenset(app.extensions['asset_manifest'].values())
+    app.view_functions['static'] = serve_static
+
+    @app.context_processor
+    def override_url_for():
+        return {'url_for': asset_url_for}
+
+
+if __name__ == '__main__':
+    static_folder = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(__file__), '..', '..', 'frontend', 'static')
+    manifest = build_assets(os.path.normpath(static_folder))
+    print(f"Built {len(manifest)} assets" + ("" if brotli else " (install brotli for .br files)"))
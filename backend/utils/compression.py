@@ -0,0 +1,69 @@
+"""
+On-the-fly compression of large API responses.
+
+Responses that are JSON, not already encoded and at least
+COMPRESS_MIN_SIZE bytes are compressed with the best encoding the client
+accepts (brotli if the brotli package is installed, otherwise gzip). Small
+responses are left alone, since compressing them costs more than it saves.
+Streamed responses, such as bulk exports, are never buffered for compression.
+"""
+
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json',)
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response, min_size=1024, level=6):
+    """Compress `response` in place if it is worth it and the client accepts it."""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    encoding = _choose_encoding()
+    if encoding is None or len(data) < min_size:
+        return response
+
+    if encoding == 'br':
+        # Low brotli qualities are fast enough for per-request use
+        compressed = brotli.compress(data, quality=min(level, 11))
+    else:
+        compressed = gzip.compress(data, compresslevel=min(level, 9))
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+
+    # The body differs per encoding, so a strong validator would be wrong
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Compress large JSON responses according to the client's Accept-Encoding."""
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+    level = app.config.get('COMPRESS_LEVEL', 6)
+
+    @app.after_request
+    def compress(response):
+        return compress_response(response, min_size, level)
@@ -0,0 +1,228 @@
+"""
+Password hashing and access tokens.
+
+Passwords are hashed with scrypt, whose cost is set by PASSWORD_HASH_METHOD.
+Hashing is deliberately slow and memory-hungry, so at most
+PASSWORD_HASH_WORKERS hashes are computed at once per process. A request that
+finds every slot taken waits up to PASSWORD_HASH_WAIT seconds for one, then
+gets a 503 with Retry-After. A burst of logins is therefore smoothed out
+rather than turned away, but cannot hold request threads for longer than
+that wait.
+Under gevent the hash runs in gevent's pool of real threads so it doesn't
+block the other greenlets. Hashes made with older settings are upgraded on
+the next successful login.
+
+After login, clients send a signed access token with every request:
+
+    Authorization: Bearer v1.<user id>.<expiry>.<signature>
+
+The signature is an HMAC-SHA256 of the rest of the token under SECRET_KEY, so
+verifying a token is a single HMAC with no password hashing and no database
+lookup. The user and their goals are then served from a short-lived
+in-process cache. Anyone who knows the key can forge tokens, so tokens are
+neither issued nor accepted with the placeholder key outside debug and
+testing.
+"""
+
+import base64
+import hashlib
+import hmac
+import threading
+import time
+from functools import wraps
+from flask import current_app, g, jsonify, request
+from werkzeug.security import check_password_hash, generate_password_hash
+from backend.utils.cache import TTLCache
+
+TOKEN_VERSION = 'v1'
+PLACEHOLDER_SECRET_KEYS = ('', '__CHANGE_ME__')
+
+_hash_slots = None
+_hash_slots_lock = threading.Lock()
+
+
+class PasswordHashBusy(Exception):
+    """Raised when every password hashing slot is taken."""
+
+    def __init__(self, retry_after=1):
+        super().__init__("Too many logins in progress")
+        self.retry_after = retry_after
+
+
+def _slots():
+    # Created on first use so that each forked server worker gets its own
+    global _hash_slots
+    if _hash_slots is None:
+        with _hash_slots_lock:
+            if _hash_slots is None:
+                _hash_slots = threading.BoundedSemaphore(
+                    current_app.config.get('PASSWORD_HASH_WORKERS', 2))
+    return _hash_slots
+
+
+def _run_hash(fn, *args):
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('threading'):
+            # Patched threads are greenlets; use gevent's pool of real threads
+            import gevent
+            return gevent.get_hub().threadpool.apply(fn, args)
+    except ImportError:
+        pass
+    return fn(*args)
+
+
+def _with_hash_slot(fn, *args):
+    """
+    Run `fn` in a password hashing slot, waiting briefly for one to free up.
+
+    Raises:
+        PasswordHashBusy: If no slot frees up within PASSWORD_HASH_WAIT seconds.
+    """
+    slots = _slots()
+    if not slots.acquire(timeout=current_app.config.get('PASSWORD_HASH_WAIT', 1.0)):
+        raise PasswordHashBusy()
+    try:
+        return _run_hash(fn, *args)
+    finally:
+        slots.release()
+
+
+def hash_password(password):
+    """Hash a password with the configured KDF."""
+    method = current_app.config.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    return _with_hash_slot(generate_password_hash, password, method)
+
+
+def verify_password(password_hash, password):
+    """Check a password against a stored hash made with any supported method."""
+    if not password_hash:
+        return False
+    return _with_hash_slot(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash):
+    """Return True if the hash was made with different KDF settings than configured."""
+    method = current_app.config.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    return password_hash.split('$', 1)[0] != method
+
+
+def _signing_key():
+    key = current_app.config.get('SECRET_KEY') or ''
+    if key in PLACEHOLDER_SECRET_KEYS and not (current_app.debug or current_app.testing):
+        raise RuntimeError("SECRET_KEY is not set; refusing to sign or verify access tokens")
+    return key.encode()
+
+
+def _sign(message):
+    digest = hmac.new(_signing_key(), message.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+
+
+def issue_token(user_id):
+    """
+    Create a signed access token for a user.
+
+    Returns:
+        tuple: (token, seconds until it expires)
+
+    Raises:
+        RuntimeError: If SECRET_KEY is still the placeholder outside debug and testing.
+    """
+    ttl = current_app.config.get('ACCESS_TOKEN_TTL', 43200)
+    message = f"{TOKEN_VERSION}.{int(user_id)}.{int(time.time()) + ttl}"
+    return f"{message}.{_sign(message)}", ttl
+
+
+def verify_token(token):
+    """Return the user id of a valid, unexpired token, or None."""
+    try:
+        version, user_id, expires, signature = token.split('.')
+    except (AttributeError, ValueError):
+        return None
+    if version != TOKEN_VERSION:
+        return None
+    try:
+        # compare_digest only accepts ASCII str, so compare bytes instead
+        signature = signature.encode('ascii')
+    except UnicodeEncodeError:
+        return None
+    if not hmac.compare_digest(signature, _sign(f"{version}.{user_id}.{expires}").encode()):
+        return None
+    try:
+        if int(expires) < time.time():
+            return None
+        return int(user_id)
+    except ValueError:
+        return None
+
+
+def token_user_id():
+    """Return the user id from the request's bearer token, or None."""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+    return verify_token(token.strip())
+
+
+def token_required(view):
+    """
+    Reject requests without a valid access token for an existing user.
+
+    Sets g.user_id and g.user (the cached profile) otherwise. Tokens of a
+    deleted user stop working once the cached profile expires, or at once
+    after invalidate_user_cache.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user_id = token_user_id()
+        user = get_cached_user(user_id) if user_id is not None else None
+        if user is None:
+            return jsonify({'error': 'A valid access token is required'}), 401
+        g.user_id = user_id
+        g.user = user
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def get_cached_user(user_id):
+    """Return the user's public profile (or None), using the in-process cache."""
+    from backend.database.db_manager import get_user_by_id
+
+    def load():
+        user = get_user_by_id(user_id)
+        if user is None:
+            return None
+        return {'id': user.id, 'username': user.username, 'email': user.email}
+
+    return current_app.extensions['user_cache'].get_or_set(('user', user_id), load)
+
+
+def get_cached_goals(user_id):
+    """Return the user's nutrient goals, using the in-process cache."""
+    from backend.services.nutrient_service import NutrientService
+    return current_app.extensions['user_cache'].get_or_set(
+        ('goals', user_id), lambda: NutrientService().get_user_goals(user_id))
+
+
+def invalidate_user_cache(user_id):
+    """Drop cached data for a user after it changes."""
+    cache = current_app.extensions['user_cache']
+    cache.invalidate(('user', user_id))
+    cache.invalidate(('goals', user_id))
+
+
+def init_security(app):
+    """
+    Create the app's cache of resolved users and goals.
+
+    Raises:
+        RuntimeError: If SECRET_KEY is still the placeholder outside debug and testing,
+                      so a misconfigured server fails at startup rather than on every login.
+    """
+    if (app.config.get('SECRET_KEY') or '') in PLACEHOLDER_SECRET_KEYS and not (app.debug or app.testing):
+        raise RuntimeError("SECRET_KEY must be set to sign access tokens")
+    app.extensions['user_cache'] = TTLCache(
+        ttl=app.config.get('USER_CACHE_TTL', 60),
+        max_size=app.config.get('USER_CACHE_SIZE', 4096)
+    )
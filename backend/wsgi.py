@@ -0,0 +1,9 @@
+"""
+WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py backend.wsgi:app
+"""
+
+from backend.app import create_app
+
+app = create_app()
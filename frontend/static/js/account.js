@@ -87,9 +87,13 @@ document.addEventListener('DOMContentLoaded', function() {
             document.querySelectorAll('.delete-log-btn').forEach(btn => {
                 btn.addEventListener('click', function() {
                     const index = parseInt(this.getAttribute('data-index'));
+                    const removed = dateEntries[index];
                     const foodLog = JSON.parse(localStorage.getItem('foodLog') || '[]');
-                    foodLog.splice(index, 1);
+                    const logIndex = foodLog.findIndex(entry =>
+                        removed.id ? entry.id === removed.id : entry.timestamp === removed.timestamp);
+                    if (logIndex !== -1) foodLog.splice(logIndex, 1);
                     localStorage.setItem('foodLog', JSON.stringify(foodLog));
+                    if (window.NutrifySync && removed.id) NutrifySync.queueChange('foodLog', removed.id, null);
                     loadFoodLog(); // Reload the food log
                 });
             });
@@ -127,4 +131,11 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Initialize food log on page load
     loadFoodLog();
+    
+    // Refresh once changes from other devices have been pulled
+    if (window.NutrifySync) {
+        NutrifySync.pull()
+            .then(changed => { if (changed) loadFoodLog(); })
+            .catch(error => console.error('Sync error:', error));
+    }
 });
\ No newline at end of file
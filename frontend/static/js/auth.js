@@ -0,0 +1,74 @@
+/**
+ * @file auth.js
+ * @description Login and registration forms
+ *
+ * The forms are posted as JSON to /login and /register. After a successful
+ * login the returned access token is handed to NutrifySync, which stores it
+ * in localStorage and starts syncing this device's data.
+ */
+
+document.addEventListener('DOMContentLoaded', function() {
+    const loginForm = document.getElementById('login-form');
+    const registerForm = document.getElementById('register-form');
+    const message = document.getElementById('auth-message');
+
+    function showMessage(text) {
+        if (message) message.textContent = text;
+    }
+
+    async function postJSON(url, body) {
+        const response = await fetch(url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body)
+        });
+        const data = await response.json().catch(() => ({}));
+        return { ok: response.ok, data };
+    }
+
+    /**
+     * Logs in and stores the access token, then opens the dashboard
+     * @async
+     * @param {string} email - Account email
+     * @param {string} password - Account password
+     */
+    async function login(email, password) {
+        const { ok, data } = await postJSON(loginForm ? loginForm.action : '/login', { email, password });
+        if (!ok) {
+            showMessage(data.message || 'Login failed');
+            return;
+        }
+        NutrifySync.setToken(data.access_token);
+        window.location.href = '/dashboard';
+    }
+
+    if (loginForm) {
+        loginForm.addEventListener('submit', function(event) {
+            event.preventDefault();
+            login(loginForm.email.value.trim(), loginForm.password.value)
+                .catch(() => showMessage('Login failed'));
+        });
+    }
+
+    if (registerForm) {
+        registerForm.addEventListener('submit', async function(event) {
+            event.preventDefault();
+            const email = registerForm.email.value.trim();
+            const password = registerForm.password.value;
+            try {
+                const { ok, data } = await postJSON(registerForm.action, {
+                    username: registerForm.username.value.trim(),
+                    email,
+                    password
+                });
+                if (!ok) {
+                    showMessage(data.message || 'Registration failed');
+                    return;
+                }
+                await login(email, password);
+            } catch (error) {
+                showMessage('Registration failed');
+            }
+        });
+    }
+});
@@ -65,6 +65,13 @@ document.addEventListener('DOMContentLoaded', function() {
     // Initial load of data
     loadNutritionData();
     
+    // Refresh once changes from other devices have been pulled
+    if (window.NutrifySync) {
+        NutrifySync.pull()
+            .then(changed => { if (changed) loadNutritionData(); })
+            .catch(error => console.error('Sync error:', error));
+    }
+    
     // Update progress functions
     function updateCaloriesProgress() {
         const consumed = parseFloat(caloriesConsumed.value) || 0;
@@ -167,6 +174,9 @@ document.addEventListener('DOMContentLoaded', function() {
         savedData[date] = nutritionData;
         localStorage.setItem('nutritionTrackerData', JSON.stringify(savedData));
         
+        // Upload only the changed day
+        if (window.NutrifySync) NutrifySync.queueChange('nutrition', date, nutritionData);
+        
         // Show success message
         showMessage('Nutrition data saved successfully!', 'success');
         
@@ -238,29 +248,6 @@ document.addEventListener('DOMContentLoaded', function() {
         }, 3000);
     }
     
-    // Fix for the sendToServer function that's causing issues
-    function sendToServer(date, nutritionData) {
-        fetch('/api/nutrition/save', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({
-                date: date,
-                data: nutritionData
-            })
-        })
-        .then(response => response.json())
-        .then(data => {
-            if (data.success) {
-                console.log('Data saved to server');
-            } else {
-                console.error('Failed to save to server');
-            }
-        })
-        .catch(error => console.error('Error:', error));
-    }
-
     analyzeBtn.addEventListener('click', async function() {
         const text = foodDescription.value.trim();
         
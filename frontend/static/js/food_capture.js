@@ -268,8 +268,9 @@ document.addEventListener('DOMContentLoaded', function() {
             // Get existing food log or initialize empty array
             let foodLog = JSON.parse(localStorage.getItem('foodLog') || '[]');
             
-            // Add timestamp
+            // Add timestamp and a stable id for syncing
             foodData.timestamp = new Date().toISOString();
+            foodData.id = window.NutrifySync ? NutrifySync.newId() : Date.now().toString(36);
             
             // Add to log
             foodLog.push(foodData);
@@ -277,6 +278,9 @@ document.addEventListener('DOMContentLoaded', function() {
             // Save back to localStorage
             localStorage.setItem('foodLog', JSON.stringify(foodLog));
             
+            // Upload only the new entry
+            if (window.NutrifySync) NutrifySync.queueChange('foodLog', foodData.id, foodData);
+            
             alert('Food saved to your log!');
         }
     });
@@ -0,0 +1,252 @@
+/**
+ * @file sync.js
+ * @description Incremental sync of the local food log and nutrition data
+ *
+ * Pages keep using localStorage as their working copy. Instead of uploading
+ * the whole history, every edit is queued as a single change and sent to
+ * /api/sync in small batches. History recorded before sync was enabled is
+ * queued once, the first time this device syncs. Changes made on other devices are pulled with
+ * the last seen version, so only entries newer than that version come back.
+ *
+ * Requests are authenticated with the access token returned by /login. The
+ * login page passes it to setToken, which keeps it in localStorage as
+ * `accessToken`; sync is skipped entirely until it is set, and the token is
+ * dropped again when the server rejects it.
+ */
+
+window.NutrifySync = (function() {
+    const QUEUE_KEY = 'syncQueue';
+    const VERSION_KEY = 'syncVersion';
+    const ETAG_KEY = 'syncEtag';
+    const SEEDED_KEY = 'syncSeeded';
+    const FLUSH_DELAY_MS = 1000;
+    const MAX_BATCH_SIZE = 500;
+
+    let flushTimer = null;
+    let flushing = false;
+
+    function getToken() {
+        return localStorage.getItem('accessToken');
+    }
+
+    /**
+     * Stores the access token from /login and starts syncing
+     * A different account starts from an empty version, so its data is pulled in full
+     * @param {string} token - Access token
+     */
+    function setToken(token) {
+        if (token !== getToken()) {
+            localStorage.removeItem(VERSION_KEY);
+            localStorage.removeItem(ETAG_KEY);
+        }
+        localStorage.setItem('accessToken', token);
+        scheduleFlush();
+    }
+
+    function authHeaders(headers = {}) {
+        return { ...headers, 'Authorization': `Bearer ${getToken()}` };
+    }
+
+    function checkAuthorized(response) {
+        // Expired or revoked token: stop syncing until the user logs in again
+        if (response.status === 401) {
+            localStorage.removeItem('accessToken');
+        }
+    }
+
+    function readJSON(key, fallback) {
+        try {
+            return JSON.parse(localStorage.getItem(key)) || fallback;
+        } catch (e) {
+            return fallback;
+        }
+    }
+
+    /**
+     * Generates a stable identifier for a new food log entry
+     * @returns {string} Unique id
+     */
+    function newId() {
+        if (window.crypto && crypto.randomUUID) {
+            return crypto.randomUUID();
+        }
+        return Date.now().toString(36) + Math.random().toString(36).slice(2, 10);
+    }
+
+    /**
+     * Queues a single upsert (or deletion when payload is null) for upload
+     * Later edits to the same entry replace earlier queued ones
+     *
+     * @param {string} collection - 'foodLog' or 'nutrition'
+     * @param {string} key - Entry id or date
+     * @param {Object|null} payload - Entry data, or null to delete
+     */
+    function queueChange(collection, key, payload) {
+        if (!key) return;
+        const queue = readJSON(QUEUE_KEY, {});
+        queue[`${collection}:${key}`] = payload === null
+            ? { collection, key, deleted: true }
+            : { collection, key, payload };
+        localStorage.setItem(QUEUE_KEY, JSON.stringify(queue));
+        scheduleFlush();
+    }
+
+    /**
+     * Queues the food log and nutrition history recorded before sync was enabled
+     * Entries saved without an id get one, so later edits map to the same key
+     */
+    function seedExistingData() {
+        if (localStorage.getItem(SEEDED_KEY)) return;
+
+        const queue = readJSON(QUEUE_KEY, {});
+        const foodLog = readJSON('foodLog', []);
+        let idsAdded = false;
+        foodLog.forEach(entry => {
+            if (!entry.id) {
+                entry.id = newId();
+                idsAdded = true;
+            }
+            // Edits already queued are newer than the stored copy
+            if (!queue[`foodLog:${entry.id}`]) {
+                queue[`foodLog:${entry.id}`] = { collection: 'foodLog', key: entry.id, payload: entry };
+            }
+        });
+        if (idsAdded) localStorage.setItem('foodLog', JSON.stringify(foodLog));
+
+        const nutrition = readJSON('nutritionTrackerData', {});
+        Object.keys(nutrition).forEach(date => {
+            if (!queue[`nutrition:${date}`]) {
+                queue[`nutrition:${date}`] = { collection: 'nutrition', key: date, payload: nutrition[date] };
+            }
+        });
+
+        localStorage.setItem(QUEUE_KEY, JSON.stringify(queue));
+        localStorage.setItem(SEEDED_KEY, '1');
+    }
+
+    function scheduleFlush() {
+        if (!getToken()) return;
+        clearTimeout(flushTimer);
+        flushTimer = setTimeout(flush, FLUSH_DELAY_MS);
+    }
+
+    /**
+     * Uploads queued changes in batches, then pulls remote changes
+     * Batches are idempotent on the server, so failed uploads are simply retried
+     * @async
+     */
+    async function flush() {
+        if (!getToken() || flushing) return;
+        flushing = true;
+
+        try {
+            seedExistingData();
+            let queue = readJSON(QUEUE_KEY, {});
+            let ids = Object.keys(queue);
+
+            while (ids.length > 0) {
+                const batchIds = ids.slice(0, MAX_BATCH_SIZE);
+                const sent = batchIds.map(id => queue[id]);
+
+                const response = await fetch('/api/sync', {
+                    method: 'POST',
+                    headers: authHeaders({ 'Content-Type': 'application/json' }),
+                    body: JSON.stringify({ changes: sent })
+                });
+                checkAuthorized(response);
+                if (!response.ok) {
+                    throw new Error(`Sync upload failed: ${response.status}`);
+                }
+
+                // Drop only entries that were not edited again while uploading
+                queue = readJSON(QUEUE_KEY, {});
+                batchIds.forEach((id, i) => {
+                    if (JSON.stringify(queue[id]) === JSON.stringify(sent[i])) {
+                        delete queue[id];
+                    }
+                });
+                localStorage.setItem(QUEUE_KEY, JSON.stringify(queue));
+                ids = Object.keys(queue).filter(id => !batchIds.includes(id));
+            }
+
+            await pull();
+        } catch (error) {
+            console.error('Sync error:', error);
+        } finally {
+            flushing = false;
+        }
+    }
+
+    /**
+     * Fetches entries changed since the last seen version and merges them locally
+     * @async
+     * @returns {Promise<boolean>} True if local data changed
+     */
+    async function pull() {
+        if (!getToken()) return false;
+
+        const since = parseInt(localStorage.getItem(VERSION_KEY)) || 0;
+        const headers = authHeaders();
+        const etag = localStorage.getItem(ETAG_KEY);
+        if (etag) headers['If-None-Match'] = etag;
+
+        const response = await fetch(`/api/sync?since=${since}`, { headers });
+        if (response.status === 304) return false;
+        checkAuthorized(response);
+        if (!response.ok) {
+            throw new Error(`Sync download failed: ${response.status}`);
+        }
+
+        const data = await response.json();
+        applyRemoteChanges(data.changes || []);
+        localStorage.setItem(VERSION_KEY, data.version);
+        if (response.headers.get('ETag')) {
+            localStorage.setItem(ETAG_KEY, response.headers.get('ETag'));
+        }
+        return data.changes && data.changes.length > 0;
+    }
+
+    function applyRemoteChanges(changes) {
+        if (changes.length === 0) return;
+
+        const pending = readJSON(QUEUE_KEY, {});
+        const foodLog = readJSON('foodLog', []);
+        const nutrition = readJSON('nutritionTrackerData', {});
+        let foodLogChanged = false;
+        let nutritionChanged = false;
+
+        changes.forEach(change => {
+            // Local edits that have not been uploaded yet win over remote ones
+            if (pending[`${change.collection}:${change.key}`]) return;
+
+            if (change.collection === 'foodLog') {
+                const index = foodLog.findIndex(entry => entry.id === change.key);
+                if (change.deleted) {
+                    if (index !== -1) foodLog.splice(index, 1);
+                } else if (index !== -1) {
+                    foodLog[index] = change.payload;
+                } else {
+                    foodLog.push(change.payload);
+                }
+                foodLogChanged = true;
+            } else if (change.collection === 'nutrition') {
+                if (change.deleted) {
+                    delete nutrition[change.key];
+                } else {
+                    nutrition[change.key] = change.payload;
+                }
+                nutritionChanged = true;
+            }
+        });
+
+        if (foodLogChanged) localStorage.setItem('foodLog', JSON.stringify(foodLog));
+        if (nutritionChanged) localStorage.setItem('nutritionTrackerData', JSON.stringify(nutrition));
+    }
+
+    // Catch up with other devices and retry anything left from a previous visit
+    document.addEventListener('DOMContentLoaded', function() {
+        if (getToken()) flush();
+    });
+
+    return { newId, queueChange, flush, pull, setToken };
+})();
@@ -0,0 +1,49 @@
+"""
+Gunicorn settings for serving Nutrify in production.
+
+Request time is dominated by waiting on the Gemini API, so each worker process
+runs many threads (or green threads with the gevent worker) instead of relying
+on process count alone. The app is preloaded in the master process so imports
+and the Gemini client are created once and shared copy-on-write by the workers.
+
+Every setting can be overridden from the environment, e.g.
+
+    WEB_CONCURRENCY=4 GUNICORN_THREADS=32 gunicorn -c gunicorn.conf.py backend.wsgi:app
+"""
+
+import multiprocessing
+import os
+from backend.config import Config
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+
+# Processes for CPU work (JSON, image decoding); threads for waiting on the model
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+# Shared with the app, which sizes its admission limits to fit these threads
+worker_class = Config.WORKER_CLASS
+threads = Config.WORKER_THREADS
+worker_connections = Config.WORKER_CONNECTIONS
+
+preload_app = True
+
+# Model calls can take a while; don't kill a worker waiting on a slow response
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Recycle workers periodically, staggered so they don't all restart at once
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """Give each worker its own connections instead of the master's."""
+    app = server.app.wsgi()
+    app.extensions['gemini_service'].reconnect()
+
+    from backend.database.models import db
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,30 @@
+import pytest
+from flask import Flask
+from backend.database.models import db, User
+from backend.utils.security import init_security
+
+
+@pytest.fixture
+def app():
+    """A bare app with an empty in-memory database; tests register the blueprints they need."""
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI='sqlite://',
+        TESTING=True,
+        SECRET_KEY='test-secret',
+        PASSWORD_HASH_METHOD='scrypt:1024:8:1'
+    )
+    db.init_app(app)
+    init_security(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def users(app):
+    """Users 1 and 2, whose access tokens are accepted by token_required views."""
+    for user_id in (1, 2):
+        db.session.add(User(id=user_id, username=f'user{user_id}', email=f'user{user_id}@example.com'))
+    db.session.commit()
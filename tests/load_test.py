@@ -0,0 +1,165 @@
+"""
+Load test for the production server configuration.
+
+Starts gunicorn with the stub Gemini service for several worker configurations
+and reports requests/sec and latency for /api/food/analyze-text. Run it from
+the repository root:
+
+    python -m tests.load_test --latency 0.2 --concurrency 64 --duration 10
+
+Add --abusive N to check that one user flooding the server does not hurt the
+latency of everyone else. Anonymous clients are told apart by IP address, so
+each simulated client connects from its own loopback address (127.x.y.z, which
+Linux routes to the local host without any setup).
+
+This is a benchmark, not part of the pytest suite.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, worker class, workers, threads)
+CONFIGURATIONS = [
+    ('1 sync worker', 'sync', 1, 1),
+    ('4 sync workers', 'sync', 4, 1),
+    ('2 workers x 16 threads', 'gthread', 2, 16),
+    ('4 workers x 32 threads', 'gthread', 4, 32),
+    ('2 gevent workers', 'gevent', 2, 1),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+def start_server(worker_class, workers, threads, latency, port, database_url):
+    env = dict(os.environ,
+               BIND=f'127.0.0.1:{port}',
+               WEB_CONCURRENCY=str(workers),
+               GUNICORN_WORKER_CLASS=worker_class,
+               GUNICORN_THREADS=str(threads),
+               GUNICORN_ACCESS_LOG='/dev/null',
+               GEMINI_STUB_LATENCY=str(latency),
+               SECRET_KEY='load-test',
+               DATABASE_URL=database_url)
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'backend.wsgi:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def run_load(port, concurrency, duration, abusive=0):
+    """
+    Keep `concurrency` well-behaved clients busy for `duration` seconds.
+
+    `abusive` extra connections all send requests from the same address at the
+    same time. Only the well-behaved clients are included in the results.
+    """
+    body = json.dumps({'text': 'one apple'}).encode()
+    headers = {'Content-Type': 'application/json'}
+    abuser = '127.2.0.1'
+    deadline = time.time() + duration
+
+    def client(address):
+        latencies, errors = [], 0
+        while time.time() < deadline:
+            start = time.perf_counter()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60,
+                                                    source_address=(address, 0))
+            try:
+                connection.request('POST', '/api/food/analyze-text', body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    # Rejected abusive requests back off as told by Retry-After
+                    errors += 1
+                    if address == abuser:
+                        time.sleep(min(float(response.getheader('Retry-After', 1)), 0.1))
+            except Exception:
+                errors += 1
+            finally:
+                connection.close()
+        return latencies, errors
+
+    clients = [f'127.1.{n // 250}.{n % 250 + 1}' for n in range(concurrency)] + [abuser] * abusive
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+        results = list(pool.map(client, clients))[:concurrency]
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(l for result, _ in results for l in result)
+    errors = sum(e for _, e in results)
+    if not latencies:
+        return 0.0, None, None, errors
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return len(latencies) / elapsed, percentile(0.5), percentile(0.99), errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.2, help='Stub model latency in seconds')
+    parser.add_argument('--concurrency', type=int, default=64, help='Concurrent client connections')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per configuration')
+    parser.add_argument('--abusive', type=int, default=0,
+                        help='Extra connections sending requests from a single address')
+    args = parser.parse_args(argv)
+
+    print(f"Stub latency {args.latency}s, {args.concurrency} concurrent clients, "
+          f"{args.abusive} abusive connections, {args.duration}s each\n")
+    print(f"{'configuration':<26}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'load_test.db')}"
+        for label, worker_class, workers, threads in CONFIGURATIONS:
+            if worker_class == 'gevent':
+                try:
+                    import gevent  # noqa: F401
+                except ImportError:
+                    print(f"{label:<26}{'skipped (gevent not installed)':>38}")
+                    continue
+
+            port = free_port()
+            server = start_server(worker_class, workers, threads, args.latency, port, database_url)
+            try:
+                wait_for_port(port)
+                rps, p50, p99, errors = run_load(port, args.concurrency, args.duration, args.abusive)
+            finally:
+                server.terminate()
+                server.wait()
+
+            if p50 is None:
+                print(f"{label:<26}{'no successful requests':>30}{errors:>8}")
+            else:
+                print(f"{label:<26}{rps:>10.1f}{p50:>10.0f}{p99:>10.0f}{errors:>8}")
+
+
+if __name__ == '__main__':
+    main()
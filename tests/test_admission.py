@@ -0,0 +1,93 @@
+import threading
+import time
+import pytest
+from flask import Flask
+from backend.utils.admission import AdmissionController, AdmissionRejected, _client_key, admission_limits, init_admission
+from backend.utils.security import issue_token
+
+
+def test_per_client_limit_rejects_with_429():
+    controller = AdmissionController(max_in_flight=10, per_client_limit=1,
+                                     per_client_queue=0, queue_timeout=0.1)
+    controller.acquire('a')
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire('a')
+    assert excinfo.value.status == 429
+    assert excinfo.value.retry_after >= 1
+
+    # Other clients are unaffected
+    controller.acquire('b')
+
+
+def test_queue_timeout_rejects_with_503():
+    controller = AdmissionController(max_in_flight=1, queue_timeout=0.05)
+    controller.acquire('a')
+
+    started = time.monotonic()
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire('b')
+    assert excinfo.value.status == 503
+    assert time.monotonic() - started < 1
+
+
+def test_waiting_clients_are_served_round_robin():
+    controller = AdmissionController(max_in_flight=1, per_client_queue=10, queue_timeout=5)
+    controller.acquire('heavy')
+    order = []
+
+    def request(client):
+        controller.acquire(client)
+        order.append(client)
+
+    threads = []
+    for client in ['heavy', 'heavy', 'heavy', 'light']:
+        thread = threading.Thread(target=request, args=(client,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.02)
+
+    for _ in range(4):
+        current = 'heavy' if not order else order[-1]
+        controller.release(current)
+        time.sleep(0.05)
+
+    for thread in threads:
+        thread.join(timeout=1)
+    assert order[:2] == ['heavy', 'light']
+
+
+def test_limits_fit_within_request_threads():
+    assert admission_limits({'WORKER_THREADS': 16}) == (8, 4)
+    assert admission_limits({'WORKER_THREADS': 1}) == (1, 0)
+    assert admission_limits({'WORKER_CLASS': 'gevent', 'WORKER_CONNECTIONS': 256}) == (128, 64)
+
+    with pytest.raises(ValueError):
+        admission_limits({'WORKER_THREADS': 16, 'ADMISSION_MAX_IN_FLIGHT': 32})
+
+
+def test_client_key_ignores_client_supplied_ids():
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'test'
+    with app.test_request_context('/?user_id=7', json={'user_id': 8},
+                                  headers={'X-User-Id': '9'}, environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+        assert _client_key() == 'ip:10.0.0.1'
+
+    with app.app_context():
+        token, _ = issue_token(7)
+    with app.test_request_context('/', headers={'Authorization': f'Bearer {token}'}):
+        assert _client_key() == 'user:7'
+
+
+def test_trusted_proxy_address_used_for_anonymous_callers():
+    app = Flask(__name__)
+    app.config.update(SECRET_KEY='test', TRUSTED_PROXY_COUNT=1)
+    init_admission(app)
+
+    @app.route('/key')
+    def key():
+        return _client_key()
+
+    client = app.test_client()
+    headers = {'X-Forwarded-For': '203.0.113.7'}
+    assert client.get('/key', headers=headers, environ_base={'REMOTE_ADDR': '10.0.0.1'}).data == b'ip:203.0.113.7'
@@ -0,0 +1,75 @@
+import gzip
+import pytest
+from flask import Flask, jsonify, render_template_string
+from backend.utils.assets import build_assets, init_assets
+from backend.utils.compression import init_compression
+
+CSS = b"body { color: #333; }\n" * 50
+
+
+@pytest.fixture
+def app(tmp_path):
+    static = tmp_path / 'static'
+    (static / 'css').mkdir(parents=True)
+    (static / 'css' / 'main.css').write_bytes(CSS)
+    build_assets(str(static))
+
+    app = Flask(__name__, static_folder=str(static))
+    init_assets(app)
+    init_compression(app)
+
+    @app.route('/api/big')
+    def big():
+        return jsonify({'items': list(range(1000))})
+
+    @app.route('/api/small')
+    def small():
+        return jsonify({'ok': True})
+
+    return app
+
+
+def test_templates_use_hashed_names(app):
+    with app.test_request_context():
+        url = render_template_string("{{ url_for('static', filename='css/main.css') }}")
+    assert url.startswith('/static/build/css/main.')
+    assert url.endswith('.css')
+
+
+def test_hashed_asset_is_precompressed_and_immutable(app):
+    with app.test_request_context():
+        url = render_template_string("{{ url_for('static', filename='css/main.css') }}")
+    client = app.test_client()
+
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.mimetype == 'text/css'
+    assert gzip.decompress(response.data) == CSS
+    assert 'immutable' in response.headers['Cache-Control']
+    assert 'max-age=31536000' in response.headers['Cache-Control']
+
+    plain = client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.data == CSS
+
+
+def test_unhashed_files_still_served(app):
+    response = app.test_client().get('/static/css/main.css')
+    assert response.data == CSS
+    assert 'immutable' not in response.headers.get('Cache-Control', '')
+
+    # The manifest lives under build/ but its name never changes
+    response = app.test_client().get('/static/build/manifest.json')
+    assert response.status_code == 200
+    assert 'immutable' not in response.headers.get('Cache-Control', '')
+
+
+def test_large_json_compressed_on_the_fly(app):
+    client = app.test_client()
+
+    response = client.get('/api/big', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert b'999' in gzip.decompress(response.data)
+
+    assert 'Content-Encoding' not in client.get('/api/big').headers
+    assert 'Content-Encoding' not in client.get('/api/small', headers={'Accept-Encoding': 'gzip'}).headers
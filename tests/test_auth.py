@@ -0,0 +1,155 @@
+import threading
+import pytest
+from flask import Flask
+from backend.database.models import db, User
+from backend.routes import auth_routes
+from backend.routes.auth_routes import auth_bp
+from backend.routes.tracking_routes import tracking_bp
+from backend.services.sync_service import SyncService
+from backend.utils import security
+from backend.utils.security import init_security, invalidate_user_cache, issue_token, verify_token
+
+
+@pytest.fixture
+def client(app):
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(tracking_bp, url_prefix='/api/tracking')
+    client = app.test_client()
+    client.post('/register', json={'email': 'a@example.com', 'password': 'secret'})
+    return client
+
+
+def login(client, password='secret'):
+    return client.post('/login', json={'email': 'a@example.com', 'password': password})
+
+
+def test_login_issues_token_accepted_by_tracking(client):
+    data = login(client).get_json()
+    assert data['token_type'] == 'Bearer'
+
+    response = client.get('/api/tracking/goals',
+                          headers={'Authorization': f"Bearer {data['access_token']}"})
+    assert response.status_code == 200
+    assert 'calories' in response.get_json()
+
+
+def test_wrong_password_rejected(client):
+    assert login(client, 'wrong').status_code == 401
+
+
+def test_missing_or_tampered_token_rejected(client):
+    token = login(client).get_json()['access_token']
+    version, user_id, expires, signature = token.split('.')
+    forged = '.'.join([version, '2', expires, signature])
+
+    assert client.get('/api/tracking/goals').status_code == 401
+    assert client.get('/api/tracking/goals?user_id=1').status_code == 401
+    assert client.get('/api/tracking/goals', headers={'Authorization': f'Bearer {forged}'}).status_code == 401
+    # Non-ASCII signatures are invalid, not a server error
+    non_ascii = 'Bearer v1.1.9999999999.\u00e9\u00e9'
+    assert client.get('/api/tracking/goals', headers={'Authorization': non_ascii}).status_code == 401
+
+
+def test_expired_token_rejected(app):
+    app.config['ACCESS_TOKEN_TTL'] = -1
+    with app.test_request_context():
+        token, _ = issue_token(1)
+        assert verify_token(token) is None
+
+
+def test_outdated_hash_upgraded_on_login(app, client):
+    app.config['PASSWORD_HASH_METHOD'] = 'scrypt:2048:8:1'
+    assert login(client).status_code == 200
+    assert User.query.one().password_hash.startswith('scrypt:2048:8:1$')
+
+
+def test_placeholder_secret_key_refused_in_production(app):
+    app.config.update(SECRET_KEY='__CHANGE_ME__', TESTING=False)
+    with pytest.raises(RuntimeError):
+        issue_token(1)
+
+    app.config['TESTING'] = True
+    assert verify_token(issue_token(1)[0]) == 1
+
+
+def test_login_waits_briefly_for_a_hashing_slot(app, client, monkeypatch):
+    app.config['PASSWORD_HASH_WAIT'] = 0.5
+    monkeypatch.setattr(security, '_hash_slots', threading.BoundedSemaphore(1))
+    security._hash_slots.acquire()
+
+    # A slot freed during the wait is used
+    threading.Timer(0.1, security._hash_slots.release).start()
+    assert login(client).status_code == 200
+
+    # No slot within the wait: rejected with a Retry-After hint
+    app.config['PASSWORD_HASH_WAIT'] = 0.05
+    security._hash_slots.acquire()
+    response = login(client)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    security._hash_slots.release()
+
+
+def test_busy_rehash_does_not_fail_login(app, client, monkeypatch):
+    app.config['PASSWORD_HASH_METHOD'] = 'scrypt:2048:8:1'
+
+    def busy(password):
+        raise security.PasswordHashBusy()
+
+    monkeypatch.setattr(auth_routes, 'hash_password', busy)
+    assert login(client).status_code == 200
+    assert User.query.one().password_hash.startswith('scrypt:1024:8:1$')
+
+
+def test_deleted_user_token_rejected(client):
+    token = login(client).get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    assert client.get('/api/tracking/goals', headers=headers).status_code == 200
+
+    user = User.query.one()
+    db.session.delete(user)
+    db.session.commit()
+    invalidate_user_cache(user.id)
+    assert client.get('/api/tracking/goals', headers=headers).status_code == 401
+
+
+def test_register_with_taken_username_rejected(client, monkeypatch):
+    response = client.post('/register', json={'email': 'b@example.com', 'password': 'x',
+                                              'username': 'a@example.com'})
+    assert response.status_code == 400
+
+    # A concurrent registration taking the username after the check
+    monkeypatch.setattr(auth_routes, 'get_user_by_username', lambda username: None)
+    response = client.post('/register', json={'email': 'b@example.com', 'password': 'x',
+                                              'username': 'a@example.com'})
+    assert response.status_code == 400
+    assert client.post('/register', json={'email': 'b@example.com', 'password': 'x'}).status_code == 201
+
+
+def test_placeholder_secret_key_fails_startup():
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = '__CHANGE_ME__'
+    with pytest.raises(RuntimeError):
+        init_security(app)
+
+    app.debug = True
+    init_security(app)
+
+
+def test_login_and_register_pages(app, client):
+    app.template_folder = '../frontend/templates'
+    assert b'login-form' in client.get('/login').data
+    assert b'register-form' in client.get('/register').data
+
+
+def test_progress_reads_synced_nutrition(client):
+    token = login(client).get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    SyncService().apply_changes(1, [{'collection': 'nutrition', 'key': '2024-01-01',
+                                     'payload': {'calories': {'consumed': 500, 'goal': 2000}}}])
+
+    progress = client.get('/api/tracking/progress?date=2024-01-01', headers=headers).get_json()
+    assert progress['calories'] == {'current': 500, 'goal': 2000}
+    assert progress['protein']['current'] == 0
+
+    assert client.get('/api/tracking/progress?date=yesterday', headers=headers).status_code == 400
@@ -0,0 +1,120 @@
+import io
+import json
+import pytest
+from backend.database.bulk import export_rows, import_rows
+from backend.routes.data_routes import data_bp
+from backend.services.sync_service import SyncService
+from backend.utils.security import issue_token
+
+
+CSV_DATA = (
+    "id,timestamp,name,calories,protein,carbs,fat\n"
+    "a,2024-01-01T08:00:00Z,Oatmeal,300,10,50,5\n"
+    "b,2024-01-01T12:00:00Z,Chicken,400,40g,0,10\n"
+    "c,2024-01-02T12:00:00Z,Rice,200,4,45,1\n"
+)
+
+
+def nutrition_for(user_id, date):
+    changes = SyncService().get_changes(user_id)['changes']
+    return next(c['payload'] for c in changes if c['collection'] == 'nutrition' and c['key'] == date)
+
+
+def test_csv_import_recomputes_days(app):
+    result = import_rows(1, io.BytesIO(CSV_DATA.encode()), 'csv', chunk_size=2)
+    assert result == {'rows': 3, 'days': 2}
+
+    day = nutrition_for(1, '2024-01-01')
+    assert day['calories']['consumed'] == 700
+    assert day['protein']['consumed'] == 50
+    assert day['calories']['goal'] == 2000
+
+
+def test_reimport_is_idempotent(app):
+    import_rows(1, io.BytesIO(CSV_DATA.encode()), 'csv')
+    version = SyncService().get_version(1)
+
+    result = import_rows(1, io.BytesIO(CSV_DATA.encode()), 'csv')
+    assert result == {'rows': 3, 'days': 0}
+    assert SyncService().get_version(1) == version
+
+
+def test_ndjson_round_trip_keeps_payload(app):
+    line = {'timestamp': '2024-03-01T09:00:00Z', 'food_name': 'Orange', 'calories': 60,
+            'vitamins_and_minerals': {'vitamin_c': '70 mg'}}
+    import_rows(1, io.BytesIO((json.dumps(line) + '\n').encode()), 'ndjson')
+
+    exported = [json.loads(row) for row in ''.join(export_rows(1, 'ndjson')).splitlines()]
+    assert len(exported) == 1
+    assert exported[0]['name'] == 'Orange'
+    assert exported[0]['vitamins_and_minerals'] == {'vitamin_c': '70 mg'}
+
+
+def test_csv_export(app):
+    import_rows(1, io.BytesIO(CSV_DATA.encode()), 'csv')
+    lines = ''.join(export_rows(1, 'csv')).splitlines()
+    assert lines[0] == 'id,timestamp,name,calories,protein,carbs,fat'
+    assert lines[2] == 'b,2024-01-01T12:00:00Z,Chicken,400.0,40.0,0.0,10.0'
+
+
+def test_parquet_round_trip(app):
+    pytest.importorskip('pyarrow')
+    import_rows(1, io.BytesIO(CSV_DATA.encode()), 'csv')
+    data = b''.join(export_rows(1, 'parquet'))
+
+    assert import_rows(2, io.BytesIO(data), 'parquet') == {'rows': 3, 'days': 2}
+    assert nutrition_for(2, '2024-01-02')['carbs']['consumed'] == 45
+
+
+def test_missing_timestamp_rejected(app):
+    with pytest.raises(ValueError):
+        import_rows(1, io.BytesIO(b"id,name\na,Apple\n"), 'csv')
+
+
+def test_non_string_timestamp_rejected(app):
+    with pytest.raises(ValueError):
+        import_rows(1, io.BytesIO(b'{"timestamp": 1700000000, "name": "Apple"}\n'), 'ndjson')
+
+
+def test_failed_import_still_recomputes_committed_days(app):
+    # The second chunk holds the bad row and is rejected as a whole
+    data = CSV_DATA.replace('2024-01-02T12:00:00Z', 'not-a-date').encode()
+    with pytest.raises(ValueError):
+        import_rows(1, io.BytesIO(data), 'csv', chunk_size=2)
+
+    assert nutrition_for(1, '2024-01-01')['calories']['consumed'] == 700
+
+
+def test_synced_entries_count_towards_recomputed_days(app):
+    SyncService().apply_changes(1, [{'collection': 'foodLog', 'key': 'synced',
+                                     'payload': {'timestamp': '2024-01-02T20:00:00Z', 'calories': 50}}])
+    import_rows(1, io.BytesIO(CSV_DATA.encode()), 'csv')
+    assert nutrition_for(1, '2024-01-02')['calories']['consumed'] == 250
+
+
+def test_routes_use_the_token_user(app, users):
+    app.register_blueprint(data_bp)
+    client = app.test_client()
+    token, _ = issue_token(2)
+    headers = {'Authorization': f'Bearer {token}'}
+
+    data = {'user_id': '1', 'format': 'csv', 'file': (io.BytesIO(CSV_DATA.encode()), 'log.csv')}
+    assert client.post('/api/food-log/import', data=data).status_code == 401
+
+    data['file'] = (io.BytesIO(CSV_DATA.encode()), 'log.csv')
+    assert client.post('/api/food-log/import', data=data, headers=headers).get_json() == {'rows': 3, 'days': 2}
+    assert client.get('/api/food-log/export?user_id=2').status_code == 401
+
+    exported = client.get('/api/food-log/export?user_id=1', headers=headers).get_data(as_text=True)
+    assert len(exported.splitlines()) == 4
+    assert ''.join(export_rows(1, 'csv')).count('\n') == 1
+
+
+def test_malformed_csv_rejected(app):
+    extra_field = b"id,timestamp,name\na,2024-01-01T08:00:00Z,Apple,unexpected\n"
+    with pytest.raises(ValueError):
+        import_rows(1, io.BytesIO(extra_field), 'csv')
+
+    oversized_field = b"id,timestamp,name\na,2024-01-01T08:00:00Z," + b"x" * 200000 + b"\n"
+    with pytest.raises(ValueError):
+        import_rows(1, io.BytesIO(oversized_field), 'csv')
@@ -0,0 +1,60 @@
+import pytest
+from backend.database.models import db, FoodItem
+from backend.routes.nutrition_routes import nutrition_bp
+from backend.services.suggestion_service import SuggestionService
+
+FOODS = [
+    ('Chicken breast', 165, 31, 0, 3.6),
+    ('Brown rice', 216, 5, 45, 1.8),
+    ('Avocado', 240, 3, 13, 22),
+    ('Butter', 717, 1, 0, 81),
+    ('Apple', 95, 0.5, 25, 0.3),
+]
+
+
+@pytest.fixture
+def client(app):
+    app.register_blueprint(nutrition_bp)
+    for name, calories, protein, carbs, fats in FOODS:
+        db.session.add(FoodItem(name=name, calories=calories, protein=protein,
+                                carbohydrates=carbs, fats=fats))
+    db.session.commit()
+    SuggestionService.invalidate()
+    return app.test_client()
+
+
+def test_exact_pair_is_best(client):
+    response = client.post('/api/nutrition/suggest', json={
+        'calories': 381, 'protein': 36, 'carbs': 45, 'fat': 5.4
+    })
+    best = response.get_json()['suggestions'][0]
+
+    assert sorted(food['name'] for food in best['foods']) == ['Brown rice', 'Chicken breast']
+    assert best['score'] == 0
+
+
+def test_exact_triple_is_best(client):
+    response = client.get('/api/nutrition/suggest?calories=476&protein=36.5&carbs=70&fat=5.7&limit=3')
+    suggestions = response.get_json()['suggestions']
+
+    assert len(suggestions) == 3
+    assert sorted(food['name'] for food in suggestions[0]['foods']) == ['Apple', 'Brown rice', 'Chicken breast']
+
+
+def test_new_foods_are_picked_up(client):
+    db.session.add(FoodItem(name='Protein shake', calories=120, protein=24, carbohydrates=3, fats=1))
+    db.session.commit()
+
+    response = client.post('/api/nutrition/suggest', json={'calories': 120, 'protein': 24, 'carbs': 3, 'fat': 1})
+    assert response.get_json()['suggestions'][0]['foods'][0]['name'] == 'Protein shake'
+
+
+def test_missing_nutrient_rejected(client):
+    response = client.post('/api/nutrition/suggest', json={'calories': 500})
+    assert response.status_code == 400
+
+
+def test_non_finite_nutrient_rejected(client):
+    for value in ('inf', '-inf', 'nan'):
+        response = client.get(f'/api/nutrition/suggest?calories={value}&protein=10&carbs=10&fat=1')
+        assert response.status_code == 400
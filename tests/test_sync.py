@@ -0,0 +1,104 @@
+import pytest
+from types import SimpleNamespace
+from backend.database.models import db, SyncCursor
+from backend.routes.sync_routes import sync_bp
+from backend.services.sync_service import SyncService
+from backend.utils.security import issue_token
+
+
+@pytest.fixture
+def client(app, users):
+    app.register_blueprint(sync_bp)
+    return app.test_client()
+
+
+def auth(user_id=1):
+    token, _ = issue_token(user_id)
+    return {'Authorization': f'Bearer {token}'}
+
+
+def push(client, changes, user_id=1):
+    return client.post('/api/sync', json={'changes': changes}, headers=auth(user_id))
+
+
+def pull(client, since=0, user_id=1, etag=None):
+    headers = auth(user_id)
+    if etag:
+        headers['If-None-Match'] = etag
+    return client.get(f'/api/sync?since={since}', headers=headers)
+
+
+def test_changes_since_version(client):
+    first = push(client, [{'collection': 'foodLog', 'key': 'a', 'payload': {'name': 'Apple'}}]).get_json()
+    push(client, [{'collection': 'foodLog', 'key': 'b', 'payload': {'name': 'Banana'}}])
+
+    data = pull(client, first['version']).get_json()
+    assert data['version'] == 2
+    assert [change['key'] for change in data['changes']] == ['b']
+
+
+def test_repeated_batch_is_idempotent(client):
+    batch = [{'collection': 'nutrition', 'key': '2024-01-01', 'payload': {'calories': 1800}}]
+    assert push(client, batch).get_json() == {'version': 1, 'applied': 1}
+    assert push(client, batch).get_json() == {'version': 1, 'applied': 0}
+
+
+def test_delete_and_users_are_isolated(client):
+    push(client, [{'collection': 'foodLog', 'key': 'a', 'payload': {'name': 'Apple'}}])
+    push(client, [{'collection': 'foodLog', 'key': 'a', 'deleted': True}])
+    push(client, [{'collection': 'foodLog', 'key': 'x', 'payload': {}}], user_id=2)
+
+    changes = pull(client, 1).get_json()['changes']
+    assert changes == [{'collection': 'foodLog', 'key': 'a', 'payload': None, 'deleted': True, 'version': 2}]
+
+
+def test_etag_not_modified(client):
+    push(client, [{'collection': 'foodLog', 'key': 'a', 'payload': {'name': 'Apple'}}])
+    response = pull(client)
+    etag = response.headers['ETag']
+
+    assert pull(client, etag=etag).status_code == 304
+
+    push(client, [{'collection': 'foodLog', 'key': 'b', 'payload': {'name': 'Banana'}}])
+    assert pull(client, etag=etag).status_code == 200
+
+
+def test_invalid_change_rejected(client):
+    response = push(client, [{'collection': 'unknown', 'key': 'a', 'payload': {}}])
+    assert response.status_code == 400
+
+
+def test_nutrition_save(client):
+    response = client.post('/api/nutrition/save', json={
+        'date': '2024-01-01', 'data': {'calories': {'consumed': 500, 'goal': 2000}}
+    }, headers=auth())
+    assert response.get_json() == {'success': True, 'version': 1}
+
+
+def test_token_required_and_client_user_id_ignored(client):
+    assert client.get('/api/sync?user_id=1').status_code == 401
+    assert client.post('/api/sync', json={'user_id': 1, 'changes': []}).status_code == 401
+
+    # The token's user is used, whatever user_id the body claims
+    change = {'collection': 'foodLog', 'key': 'a', 'payload': {}}
+    client.post('/api/sync', json={'user_id': 1, 'changes': [change]}, headers=auth(2))
+    assert pull(client).get_json()['changes'] == []
+    assert len(pull(client, user_id=2).get_json()['changes']) == 1
+
+
+def test_concurrent_first_batch_reuses_cursor(client, monkeypatch):
+    db.session.add(SyncCursor(user_id=1, version=5))
+    db.session.commit()
+
+    # Simulate losing the race: the UPDATE ran before the other batch inserted the cursor
+    real_execute = db.session.execute
+    calls = []
+
+    def racing_execute(statement, *args, **kwargs):
+        if not calls:
+            calls.append(statement)
+            return SimpleNamespace(rowcount=0)
+        return real_execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db.session, 'execute', racing_execute)
+    assert SyncService().reserve_version(1) == 6